@@ -1,15 +1,16 @@
 # app.py
 import streamlit as st
-import networkx as nx
-import pandas as pd
 import time
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
+from datetime import datetime
+# pandas and plotly.express are imported inside the panels that use them,
+# so they are only loaded once one of those panels is actually rendered
 
 from network_builder import NetworkBuilder
+from network_registry import NetworkRegistry
 from metrics_calculator import MetricsCalculator
 from visualizer import NetworkVisualizer
+from performance import (PerformanceMonitor, OVERHEAD_LIMIT, estimate_overhead,
+                         start_profile, stop_profile, use_monitor)
 import config
 # Page configuration
 st.set_page_config(
@@ -40,285 +41,552 @@ st.markdown("""
     }
 </style>
 """, unsafe_allow_html=True)
-# Initialize session state
-if 'network_builder' not in st.session_state:
-    st.session_state.network_builder = NetworkBuilder()
-    st.session_state.network_builder.initialize_network()
-
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = datetime.now()
-
-if 'update_history_data' not in st.session_state:
-    st.session_state.update_history_data = []
-
-if 'metrics_history' not in st.session_state:
-    st.session_state.metrics_history = []
-# Title
-st.markdown('<h1 class="main-header"><i class="fas fa-project-diagram"></i> Real-Time Network Monitoring Dashboard</h1>', 
-            unsafe_allow_html=True)
-st.markdown("---")
-# Sidebar
-st.sidebar.markdown('<h2><i class="fas fa-cog"></i> Dashboard Controls</h2>', unsafe_allow_html=True)
-
-# Auto-refresh toggle
-auto_refresh = st.sidebar.checkbox("Auto-refresh", value=False)
-refresh_interval = st.sidebar.slider("Refresh interval (seconds)", 1, 60, 5)
-
-# Manual refresh button
-if st.sidebar.button("Refresh Now", use_container_width=True):
-    updates = st.session_state.network_builder.update_network()
-    st.session_state.last_update = datetime.now()
-    if updates:
-        st.session_state.update_history_data.extend(updates)
-    st.rerun()
-st.sidebar.markdown("---")
-
-# Network settings
-st.sidebar.markdown('<h3><i class="fas fa-network-wired"></i> Network Settings</h3>', unsafe_allow_html=True)
-network_type = st.sidebar.selectbox(
-    "Network Type",
-    ["barabasi_albert", "erdos_renyi", "watts_strogatz"],
-    index=0,
-    help="Note: Changing this requires resetting the network to take effect"
-)
+# Every session records into its own monitor; use_monitor() routes the
+# instrumented modules to it for this script run
+if 'perf_monitor' not in st.session_state:
+    st.session_state.perf_monitor = PerformanceMonitor()
+monitor = st.session_state.perf_monitor
+use_monitor(monitor)
 
-if st.sidebar.button("Reset Network", use_container_width=True):
-    # Reset network builder with current network type
-    st.session_state.network_builder = NetworkBuilder()
-    # Update network type before initializing
-    st.session_state.network_builder.simulator.network_type = network_type
-    st.session_state.network_builder.initialize_network()
-    st.session_state.update_history_data = []
-    st.session_state.metrics_history = []
-    st.session_state.last_update = datetime.now()
-    st.rerun()
-st.sidebar.markdown("---")
-
-# Visualization settings
-st.sidebar.markdown('<h3><i class="fas fa-palette"></i> Visualization Settings</h3>', unsafe_allow_html=True)
-layout_type = st.sidebar.selectbox(
-    "Layout Algorithm",
-    ["spring", "circular", "kamada_kawai"],
-    index=0
-)
+# Start timing the render and, if requested, profiling this rerun
+render_start = time.perf_counter()
+calls_at_start = monitor.calls
+profiler = None
+if st.session_state.get('profile_next_rerun'):
+    st.session_state.profile_next_rerun = False
+    try:
+        profiler = start_profile()
+    except ValueError:
+        # Python 3.12+ allows only one active profiler per process
+        st.session_state.profile_busy = True
+
+# The profiler is stopped even if this run raises or calls st.rerun()/st.stop()
+try:
+    # Initialize session state
+    if 'network_builder' not in st.session_state:
+        st.session_state.network_builder = NetworkBuilder()
+        st.session_state.network_builder.initialize_network()
+
+    if 'last_update' not in st.session_state:
+        st.session_state.last_update = datetime.now()
+
+    if 'update_history_data' not in st.session_state:
+        st.session_state.update_history_data = []
+
+    if 'metrics_history' not in st.session_state:
+        st.session_state.metrics_history = []
+    # Title
+    st.markdown('<h1 class="main-header"><i class="fas fa-project-diagram"></i> Real-Time Network Monitoring Dashboard</h1>', 
+                unsafe_allow_html=True)
+    st.markdown("---")
+    # Sidebar
+    st.sidebar.markdown('<h2><i class="fas fa-cog"></i> Dashboard Controls</h2>', unsafe_allow_html=True)
+
+    # Monitoring mode: one network, or every network in config.NETWORKS
+    monitoring_mode = st.sidebar.radio(
+        "Monitoring Mode",
+        ["Single network", "Multi-network"],
+        key="monitoring_mode",
+        help="Multi-network monitors every network listed in config.NETWORKS"
+    )
+
+    if monitoring_mode == "Multi-network":
+        if 'network_registry' not in st.session_state:
+            st.session_state.network_registry = NetworkRegistry.from_config()
+        registry = st.session_state.network_registry
+        selected_network = st.sidebar.selectbox(
+            "Drill down into network",
+            registry.names(),
+            key="selected_network"
+        )
+        network_builder = registry.get_builder(selected_network)
+    else:
+        registry = None
+        selected_network = None
+        network_builder = st.session_state.network_builder
+
+    # Histories belong to the network being shown; start over when it changes
+    if st.session_state.get('active_network', selected_network) != selected_network:
+        st.session_state.update_history_data = []
+        st.session_state.metrics_history = []
+    st.session_state.active_network = selected_network
+
+
+    def refresh_networks(due_only=False):
+        """Update the monitored network(s) and record the shown network's updates"""
+        if registry is not None:
+            all_updates = registry.update_due() if due_only else registry.update_all()
+            updates = all_updates.get(selected_network, [])
+        else:
+            updates = network_builder.update_network()
+        st.session_state.last_update = datetime.now()
+        if updates:
+            st.session_state.update_history_data.extend(updates)
+
+
+    # Auto-refresh toggle
+    auto_refresh = st.sidebar.checkbox("Auto-refresh", value=False)
+    refresh_interval = st.sidebar.slider("Refresh interval (seconds)", 1, 60, 5)
+
+    # Manual refresh button
+    if st.sidebar.button("Refresh Now", use_container_width=True):
+        refresh_networks()
+        st.rerun()
+    st.sidebar.markdown("---")
+
+    # Network settings
+    st.sidebar.markdown('<h3><i class="fas fa-network-wired"></i> Network Settings</h3>', unsafe_allow_html=True)
+    network_type = st.sidebar.selectbox(
+        "Network Type",
+        ["barabasi_albert", "erdos_renyi", "watts_strogatz"],
+        index=0,
+        help="Note: Changing this requires resetting the network to take effect",
+        disabled=registry is not None
+    )
 
-show_labels = st.sidebar.checkbox("Show Node Labels", value=True)
-
-st.sidebar.markdown("---")
-# Get current network
-G = st.session_state.network_builder.get_network()
-
-# Calculate metrics
-metrics_calc = MetricsCalculator(G)
-all_metrics = metrics_calc.get_all_metrics()
-
-# Store metrics history (only if network actually changed)
-# Check if this is a new update by comparing with last entry
-if not st.session_state.metrics_history or \
-   (st.session_state.metrics_history[-1]['nodes'] != all_metrics['nodes'] or
-    st.session_state.metrics_history[-1]['edges'] != all_metrics['edges']):
-    current_time = datetime.now()
-    st.session_state.metrics_history.append({
-        'timestamp': current_time,
-        'nodes': all_metrics['nodes'],
-        'edges': all_metrics['edges'],
-        'density': all_metrics['density']
-    })
+    if st.sidebar.button("Reset Network", use_container_width=True):
+        if registry is not None:
+            # Rebuild every network from config.NETWORKS
+            st.session_state.network_registry = NetworkRegistry.from_config()
+        else:
+            # Reset network builder with current network type
+            st.session_state.network_builder = NetworkBuilder()
+            # Update network type before initializing
+            st.session_state.network_builder.simulator.network_type = network_type
+            st.session_state.network_builder.initialize_network()
+        st.session_state.update_history_data = []
+        st.session_state.metrics_history = []
+        st.session_state.last_update = datetime.now()
+        st.rerun()
+    st.sidebar.markdown("---")
+
+    # Visualization settings
+    st.sidebar.markdown('<h3><i class="fas fa-palette"></i> Visualization Settings</h3>', unsafe_allow_html=True)
+    layout_type = st.sidebar.selectbox(
+        "Layout Algorithm",
+        ["spring", "circular", "kamada_kawai"],
+        index=0
+    )
+
+    show_labels = st.sidebar.checkbox("Show Node Labels", value=True)
+
+    # k-core filter: only nodes with at least this coreness are laid out and drawn
+    max_coreness = max(network_builder.core_decomposition.max_core(), 1)
+    if st.session_state.get('min_coreness', 0) > max_coreness:
+        st.session_state.min_coreness = max_coreness
+    min_coreness = st.sidebar.slider(
+        "Minimum coreness",
+        0, max_coreness, 0,
+        key="min_coreness",
+        help="Only draw nodes in the k-core; shrinks layout and rendering cost on large networks"
+    )
+
+    st.sidebar.markdown("---")
+
+    # Performance instrumentation
+    st.sidebar.markdown('<h3><i class="fas fa-tachometer-alt"></i> Performance</h3>', unsafe_allow_html=True)
+    monitor.enabled = st.sidebar.checkbox(
+        "Enable instrumentation",
+        value=False,
+        help="Time each render stage and show rolling p50/p95/p99"
+    )
+    if st.sidebar.button("Profile Next Rerun", use_container_width=True):
+        st.session_state.profile_next_rerun = True
+        st.rerun()
+    # Filled in at the end of the script once this render has been timed
+    perf_panel = st.sidebar.container()
+
+    st.sidebar.markdown("---")
+    # Get current network
+    with monitor.timer('app.get_network'):
+        G = network_builder.get_network()
+
+    # Calculate metrics
+    metrics_calc = MetricsCalculator(G, core_numbers=network_builder.get_core_numbers())
+    with monitor.timer('app.metrics'):
+        all_metrics = metrics_calc.get_all_metrics()
+
+    # Store metrics history (only if network actually changed)
+    # Check if this is a new update by comparing with last entry
+    if not st.session_state.metrics_history or \
+       (st.session_state.metrics_history[-1]['nodes'] != all_metrics['nodes'] or
+        st.session_state.metrics_history[-1]['edges'] != all_metrics['edges']):
+        current_time = datetime.now()
+        st.session_state.metrics_history.append({
+            'timestamp': current_time,
+            'nodes': all_metrics['nodes'],
+            'edges': all_metrics['edges'],
+            'density': all_metrics['density']
+        })
     
-    # Keep only last 100 entries
-    if len(st.session_state.metrics_history) > 100:
-        st.session_state.metrics_history = st.session_state.metrics_history[-100:]
-# Main content area
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    st.markdown('<h2><i class="fas fa-sitemap"></i> Network Visualization</h2>', unsafe_allow_html=True)
+        # Keep only last 100 entries
+        if len(st.session_state.metrics_history) > 100:
+            st.session_state.metrics_history = st.session_state.metrics_history[-100:]
+    # Multi-network summary
+    if registry is not None:
+        st.markdown('<h2><i class="fas fa-th-list"></i> Monitored Networks</h2>', unsafe_allow_html=True)
+        with monitor.timer('app.multi_network'):
+            network_summary = registry.get_summary()
     
-    # Detect communities
-    community_dict = metrics_calc.detect_communities()
+        import pandas as pd
     
-    # Calculate centrality
-    centrality_metrics = metrics_calc.calculate_centrality_metrics()
-    degree_cent = centrality_metrics.get('degree', {})
+        summary_df = pd.DataFrame(network_summary)[[
+            'name', 'network_type', 'update_interval', 'nodes', 'edges',
+            'density', 'average_degree', 'num_components', 'modularity'
+        ]].rename(columns={
+            'name': 'Network',
+            'network_type': 'Type',
+            'update_interval': 'Update Interval (s)',
+            'nodes': 'Nodes',
+            'edges': 'Edges',
+            'density': 'Density',
+            'average_degree': 'Avg Degree',
+            'num_components': 'Components',
+            'modularity': 'Modularity'
+        }).round(4)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        st.caption(f"Details below are for **{selected_network}**. "
+                   f"Pick another network under \"Drill down into network\" in the sidebar.")
+        st.markdown("---")
+    # Main content area
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown('<h2><i class="fas fa-sitemap"></i> Network Visualization</h2>', unsafe_allow_html=True)
     
-    # Create visualization
-    visualizer = NetworkVisualizer(G)
-    fig = visualizer.create_plotly_network(
-        community_dict=community_dict,
-        centrality_dict=degree_cent,
-        layout=layout_type,
-        show_labels=show_labels
-    )
+        # Detect communities
+        with monitor.timer('app.communities'):
+            community_dict = metrics_calc.detect_communities()
     
-    st.plotly_chart(fig, use_container_width=True, height=600)
+        # Calculate centrality (only degree is needed for node sizes)
+        with monitor.timer('app.centrality'):
+            degree_cent = metrics_calc.calculate_centrality('degree')
     
-    # Network info
-    col_info1, col_info2, col_info3 = st.columns(3)
-    with col_info1:
-        st.metric("Nodes", all_metrics['nodes'])
-    with col_info2:
-        st.metric("Edges", all_metrics['edges'])
-    with col_info3:
-        st.metric("Communities", len(set(community_dict.values())) if community_dict else 0)
-
-with col2:
-    st.markdown('<h2><i class="fas fa-chart-line"></i> Live Metrics</h2>', unsafe_allow_html=True)
+        # Prune to the selected k-core before layout and drawing
+        G_view = metrics_calc.get_k_core(min_coreness)
+        if min_coreness > 0:
+            st.caption(f"Showing {G_view.number_of_nodes()} of {G.number_of_nodes()} nodes "
+                       f"with coreness ≥ {min_coreness}")
     
-    # Key metrics
-    st.metric("Density", f"{all_metrics['density']:.4f}")
-    st.metric("Avg Degree", f"{all_metrics['average_degree']:.2f}")
-    st.metric("Clustering", f"{all_metrics['clustering']:.4f}")
+        # Create visualization
+        visualizer = NetworkVisualizer(G_view)
+        with monitor.timer('app.visualize'):
+            fig = visualizer.create_plotly_network(
+                community_dict=community_dict,
+                centrality_dict=degree_cent,
+                layout=layout_type,
+                show_labels=show_labels
+            )
     
-    if all_metrics['modularity'] is not None:
-        st.metric("Modularity", f"{all_metrics['modularity']:.4f}")
+        with monitor.timer('app.chart.network'):
+            st.plotly_chart(fig, use_container_width=True, height=600)
     
-    st.markdown("---")
+        # Network info
+        col_info1, col_info2, col_info3 = st.columns(3)
+        with col_info1:
+            st.metric("Nodes", all_metrics['nodes'])
+        with col_info2:
+            st.metric("Edges", all_metrics['edges'])
+        with col_info3:
+            st.metric("Communities", len(set(community_dict.values())) if community_dict else 0)
+
+    with col2:
+        st.markdown('<h2><i class="fas fa-chart-line"></i> Live Metrics</h2>', unsafe_allow_html=True)
     
-    # Connectivity status
-    if all_metrics['is_connected']:
-        st.markdown('<div style="color: green;"><i class="fas fa-check-circle"></i> Network is Connected</div>', unsafe_allow_html=True)
-        if all_metrics['diameter'] is not None:
-            st.metric("Diameter", all_metrics['diameter'])
-    else:
-        st.markdown(f'<div style="color: orange;"><i class="fas fa-exclamation-triangle"></i> {all_metrics["num_components"]} Components</div>', unsafe_allow_html=True)
+        # Key metrics
+        st.metric("Density", f"{all_metrics['density']:.4f}")
+        st.metric("Avg Degree", f"{all_metrics['average_degree']:.2f}")
+        st.metric("Clustering", f"{all_metrics['clustering']:.4f}")
+        st.metric("Max Coreness", all_metrics['max_coreness'])
     
-    st.markdown("---")
+        if all_metrics['modularity'] is not None:
+            st.metric("Modularity", f"{all_metrics['modularity']:.4f}")
+    
+        st.markdown("---")
+    
+        # Connectivity status
+        if all_metrics['is_connected']:
+            st.markdown('<div style="color: green;"><i class="fas fa-check-circle"></i> Network is Connected</div>', unsafe_allow_html=True)
+            if all_metrics['diameter'] is not None:
+                st.metric("Diameter", all_metrics['diameter'])
+        else:
+            st.markdown(f'<div style="color: orange;"><i class="fas fa-exclamation-triangle"></i> {all_metrics["num_components"]} Components</div>', unsafe_allow_html=True)
+    
+        st.markdown("---")
     
-    # Last update time
-    time_diff = (datetime.now() - st.session_state.last_update).total_seconds()
-    st.caption(f"Last updated: {st.session_state.last_update.strftime('%H:%M:%S')}")
-    st.caption(f"({int(time_diff)}s ago)")
+        # Last update time
+        time_diff = (datetime.now() - st.session_state.last_update).total_seconds()
+        st.caption(f"Last updated: {st.session_state.last_update.strftime('%H:%M:%S')}")
+        st.caption(f"({int(time_diff)}s ago)")
     
-    # Update statistics
-    stats = st.session_state.network_builder.get_network_stats()
+        # Update statistics
+        stats = network_builder.get_network_stats()
+        st.markdown("---")
+        st.caption(f"Total updates: {stats['update_count']}")
+    # Filter section
     st.markdown("---")
-    st.caption(f"Total updates: {stats['update_count']}")
-# Filter section
-st.markdown("---")
-st.markdown('<h2><i class="fas fa-filter"></i> Filter Network</h2>', unsafe_allow_html=True)
-
-col3, col4 = st.columns(2)
-
-with col3:
-    st.subheader("Filter by Community")
-    if community_dict:
-        communities = sorted(set(community_dict.values()))
-        selected_communities = st.multiselect(
-            "Select communities to display",
-            communities,
-            default=communities,
-            key="community_filter"
-        )
+    st.markdown('<h2><i class="fas fa-filter"></i> Filter Network</h2>', unsafe_allow_html=True)
+
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.subheader("Filter by Community")
+        if community_dict:
+            communities = sorted(set(community_dict.values()))
+            selected_communities = st.multiselect(
+                "Select communities to display",
+                communities,
+                default=communities,
+                key="community_filter"
+            )
         
-        if selected_communities:
-            filtered_nodes = [node for node, comm in community_dict.items() 
-                            if comm in selected_communities]
-            G_filtered = G.subgraph(filtered_nodes)
+            if selected_communities:
+                core_numbers = metrics_calc.calculate_core_numbers()
+                filtered_nodes = [node for node, comm in community_dict.items() 
+                                if comm in selected_communities and
+                                core_numbers.get(node, 0) >= min_coreness]
+                G_filtered = G.subgraph(filtered_nodes)
             
-            if G_filtered.number_of_nodes() > 0:
-                st.success(f"Showing {G_filtered.number_of_nodes()} nodes "
-                          f"from {len(selected_communities)} communities")
-            else:
-                st.warning("No nodes in selected communities")
-    else:
-        st.info("No communities detected")
-
-with col4:
-    st.subheader("Filter by Centrality")
-    centrality_type = st.selectbox(
-        "Centrality measure",
-        ['degree', 'betweenness', 'closeness', 'eigenvector'],
-        key="centrality_type"
+                if G_filtered.number_of_nodes() > 0:
+                    st.success(f"Showing {G_filtered.number_of_nodes()} nodes "
+                              f"from {len(selected_communities)} communities")
+                else:
+                    st.warning("No nodes in selected communities")
+        else:
+            st.info("No communities detected")
+
+    with col4:
+        st.subheader("Filter by Centrality")
+        centrality_type = st.selectbox(
+            "Centrality measure",
+            ['degree', 'betweenness', 'closeness', 'eigenvector', 'coreness'],
+            key="centrality_type",
+            help="Coreness (k-core number) is available at any network size"
+        )
+    
+        top_k = st.slider("Top K nodes", 5, 50, 10, key="top_k")
+    
+        # Get top central nodes
+        with monitor.timer('app.top_nodes'):
+            top_nodes = metrics_calc.get_top_central_nodes(centrality_type, top_k)
+    
+        if top_nodes:
+            import pandas as pd
+            st.write("**Top central nodes:**")
+            df_top = pd.DataFrame(top_nodes, columns=['Node', 'Centrality'])
+            st.dataframe(df_top, use_container_width=True, hide_index=True)
+        else:
+            st.info(f"Centrality '{centrality_type}' not available for this network size")
+    # Centrality comparison
+    st.markdown("---")
+    st.markdown('<h2><i class="fas fa-chart-bar"></i> Centrality Analysis</h2>', unsafe_allow_html=True)
+
+    show_centrality_comparison = st.checkbox(
+        "Show centrality comparison",
+        value=False,
+        key="show_centrality_comparison",
+        help="Computes every centrality measure, which is slow on large networks"
     )
+    if show_centrality_comparison:
+        with monitor.timer('app.centrality.all'):
+            centrality_metrics = metrics_calc.calculate_centrality_metrics()
+
+    if not show_centrality_comparison:
+        st.caption("Enable to compare degree, betweenness, closeness and eigenvector centrality")
+    elif centrality_metrics.get('degree'):
+        import pandas as pd
+        import plotly.express as px
     
-    top_k = st.slider("Top K nodes", 5, 50, 10, key="top_k")
+        # Create comparison chart
+        centrality_df = pd.DataFrame(centrality_metrics)
+        centrality_df = centrality_df.head(20)  # Top 20 nodes
     
-    # Get top central nodes
-    top_nodes = metrics_calc.get_top_central_nodes(centrality_type, top_k)
+        if not centrality_df.empty:
+            fig_bar = px.bar(
+                centrality_df,
+                title="Top 20 Nodes: Centrality Comparison",
+                labels={'index': 'Node', 'value': 'Centrality Score'},
+                barmode='group'
+            )
+            fig_bar.update_layout(height=400)
+            with monitor.timer('app.chart.centrality'):
+                st.plotly_chart(fig_bar, use_container_width=True)
+    # Network evolution over time
+    st.markdown("---")
+    st.markdown('<h2><i class="fas fa-chart-area"></i> Network Evolution</h2>', unsafe_allow_html=True)
+
+    show_evolution = st.checkbox("Show evolution charts", value=False, key="show_evolution")
+
+    if not show_evolution:
+        st.caption("Enable to chart nodes, edges and density over time")
+    elif len(st.session_state.metrics_history) > 1:
+        import pandas as pd
+        import plotly.express as px
     
-    if top_nodes:
-        st.write("**Top central nodes:**")
-        df_top = pd.DataFrame(top_nodes, columns=['Node', 'Centrality'])
-        st.dataframe(df_top, use_container_width=True, hide_index=True)
-    else:
-        st.info(f"Centrality '{centrality_type}' not available for this network size")
-# Centrality comparison
-st.markdown("---")
-st.markdown('<h2><i class="fas fa-chart-bar"></i> Centrality Analysis</h2>', unsafe_allow_html=True)
-
-if centrality_metrics and centrality_metrics.get('degree') and len(centrality_metrics.get('degree', {})) > 0:
-    # Create comparison chart
-    centrality_df = pd.DataFrame(centrality_metrics)
-    centrality_df = centrality_df.head(20)  # Top 20 nodes
+        history_df = pd.DataFrame(st.session_state.metrics_history)
     
-    if not centrality_df.empty:
-        fig_bar = px.bar(
-            centrality_df,
-            title="Top 20 Nodes: Centrality Comparison",
-            labels={'index': 'Node', 'value': 'Centrality Score'},
-            barmode='group'
-        )
-        fig_bar.update_layout(height=400)
-        st.plotly_chart(fig_bar, use_container_width=True)
-# Network evolution over time
-st.markdown("---")
-st.markdown('<h2><i class="fas fa-chart-area"></i> Network Evolution</h2>', unsafe_allow_html=True)
-
-if len(st.session_state.metrics_history) > 1:
-    history_df = pd.DataFrame(st.session_state.metrics_history)
+        col_evo1, col_evo2 = st.columns(2)
     
-    col_evo1, col_evo2 = st.columns(2)
+        with col_evo1:
+            fig_nodes = px.line(
+                history_df,
+                x='timestamp',
+                y='nodes',
+                title='Number of Nodes Over Time',
+                labels={'nodes': 'Nodes', 'timestamp': 'Time'}
+            )
+            with monitor.timer('app.chart.evolution'):
+                st.plotly_chart(fig_nodes, use_container_width=True)
     
-    with col_evo1:
-        fig_nodes = px.line(
-            history_df,
-            x='timestamp',
-            y='nodes',
-            title='Number of Nodes Over Time',
-            labels={'nodes': 'Nodes', 'timestamp': 'Time'}
-        )
-        st.plotly_chart(fig_nodes, use_container_width=True)
+        with col_evo2:
+            fig_edges = px.line(
+                history_df,
+                x='timestamp',
+                y='edges',
+                title='Number of Edges Over Time',
+                labels={'edges': 'Edges', 'timestamp': 'Time'}
+            )
+            with monitor.timer('app.chart.evolution'):
+                st.plotly_chart(fig_edges, use_container_width=True)
     
-    with col_evo2:
-        fig_edges = px.line(
+        fig_density = px.line(
             history_df,
             x='timestamp',
-            y='edges',
-            title='Number of Edges Over Time',
-            labels={'edges': 'Edges', 'timestamp': 'Time'}
+            y='density',
+            title='Network Density Over Time',
+            labels={'density': 'Density', 'timestamp': 'Time'}
         )
-        st.plotly_chart(fig_edges, use_container_width=True)
+        with monitor.timer('app.chart.evolution'):
+            st.plotly_chart(fig_density, use_container_width=True)
+    else:
+        st.info("Network evolution data will appear after updates")
+    # Update history
+    st.markdown("---")
+    st.markdown('<h2><i class="fas fa-history"></i> Recent Updates</h2>', unsafe_allow_html=True)
+
+    show_updates = st.checkbox("Show update table", value=False, key="show_updates")
+
+    if not show_updates:
+        st.caption(f"{len(st.session_state.update_history_data)} updates recorded")
+    elif st.session_state.update_history_data:
+        import pandas as pd
     
-    fig_density = px.line(
-        history_df,
-        x='timestamp',
-        y='density',
-        title='Network Density Over Time',
-        labels={'density': 'Density', 'timestamp': 'Time'}
-    )
-    st.plotly_chart(fig_density, use_container_width=True)
-else:
-    st.info("Network evolution data will appear after updates")
-# Update history
-st.markdown("---")
-st.markdown('<h2><i class="fas fa-history"></i> Recent Updates</h2>', unsafe_allow_html=True)
-
-if st.session_state.update_history_data:
-    recent_updates = st.session_state.update_history_data[-20:]  # Last 20 updates
-    updates_df = pd.DataFrame(recent_updates)
-    st.dataframe(updates_df, use_container_width=True, hide_index=True)
-else:
-    st.info("No updates yet. Click 'Refresh Now' to simulate network updates.")
-
-# Footer
-st.markdown("---")
-st.markdown('<p style="text-align: center; color: #666;"><i class="fas fa-project-diagram"></i> Network Monitoring Dashboard | Real-time Network Analysis</p>', unsafe_allow_html=True)
+        recent_updates = st.session_state.update_history_data[-20:]  # Last 20 updates
+        updates_df = pd.DataFrame(recent_updates)
+        with monitor.timer('app.chart.updates'):
+            st.dataframe(updates_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No updates yet. Click 'Refresh Now' to simulate network updates.")
+
+    # Streaming statistics
+    st.markdown("---")
+    st.markdown('<h2><i class="fas fa-bolt"></i> Streaming Statistics</h2>', unsafe_allow_html=True)
+
+    stream_stats = network_builder.stream_stats
+    stream_summary = stream_stats.get_summary()
+
+    col_s1, col_s2, col_s3 = st.columns(3)
+    with col_s1:
+        st.metric("Events Processed", stream_summary['events_processed'])
+    with col_s2:
+        st.metric("Spike Alerts", stream_summary['anomalies'])
+    with col_s3:
+        st.metric("Sketch Memory", f"{stream_summary['memory_bytes'] / 1024:.0f} KB")
+
+    col_hh, col_spikes = st.columns(2)
+
+    with col_hh:
+        st.subheader("Heavy Hitters")
+        with monitor.timer('app.stream_stats'):
+            heavy_hitters = stream_stats.get_heavy_hitters(config.TOP_K_NODES)
+        if heavy_hitters:
+            import pandas as pd
+        
+            hh_df = pd.DataFrame(heavy_hitters).drop(columns='error').rename(columns={
+                'node': 'Node',
+                'guaranteed_connections': 'New Connections (at least)',
+                'new_connections': 'New Connections (at most)',
+                'rate': 'Rate / Update',
+                'distinct_neighbours': f'Distinct Peers ({config.DISTINCT_WINDOW_SECONDS // 60} min)'
+            }).round(2)
+            st.dataframe(hh_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("Heavy hitters will appear after updates")
+
+    with col_spikes:
+        st.subheader("Degree-Spike Alerts")
+        spikes = stream_stats.get_recent_anomalies()
+        if spikes:
+            import pandas as pd
+        
+            spikes_df = pd.DataFrame(spikes).rename(columns={
+                'node': 'Node',
+                'new_connections': f'New Connections (last {config.SPIKE_WINDOW} updates)',
+                'baseline': 'Expected',
+                'score': 'Score',
+                'timestamp': 'Time'
+            }).round(2)
+            st.dataframe(spikes_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No degree spikes detected")
+
+    # Footer
+    st.markdown("---")
+    st.markdown('<p style="text-align: center; color: #666;"><i class="fas fa-project-diagram"></i> Network Monitoring Dashboard | Real-time Network Analysis</p>', unsafe_allow_html=True)
+
+    # Performance panel (filled after the render so it includes this rerun)
+    if monitor.enabled:
+        render_s = time.perf_counter() - render_start
+        monitor.record('app.render', render_s)
+        render_overhead = estimate_overhead(monitor.calls - calls_at_start, render_s)
+finally:
+    if profiler is not None:
+        st.session_state.profile_report = stop_profile(profiler)
+
+with perf_panel:
+    if monitor.enabled:
+        perf_stats = monitor.get_stats()
+        if perf_stats:
+            import pandas as pd
+            
+            perf_df = pd.DataFrame([
+                {
+                    'Stage': name,
+                    'Calls': entry['count'],
+                    'Last (ms)': entry['last_s'] * 1000,
+                    'p50 (ms)': entry['p50_s'] * 1000,
+                    'p95 (ms)': entry['p95_s'] * 1000,
+                    'p99 (ms)': entry['p99_s'] * 1000
+                }
+                for name, entry in sorted(perf_stats.items())
+            ]).round(2)
+            st.dataframe(perf_df, use_container_width=True, hide_index=True)
+        st.caption(f"Instrumentation overhead: {render_overhead:.3%} of this render "
+                   f"(limit {OVERHEAD_LIMIT:.0%})")
+        counters = monitor.get_counters()
+        if counters:
+            st.caption(" | ".join(f"{name}: {value}" for name, value in sorted(counters.items())))
+        col_dl1, col_dl2 = st.columns(2)
+        with col_dl1:
+            st.download_button("JSON", monitor.to_json(),
+                               file_name="performance.json", mime="application/json",
+                               use_container_width=True)
+        with col_dl2:
+            st.download_button("Prometheus", monitor.to_prometheus(),
+                               file_name="performance.prom", mime="text/plain",
+                               use_container_width=True)
+        if st.button("Reset Timings", use_container_width=True):
+            monitor.reset()
+            st.rerun()
+    if st.session_state.pop('profile_busy', False):
+        st.warning("Profiler busy: another session is profiling, try again shortly")
+    if st.session_state.get('profile_report'):
+        with st.expander("Last cProfile capture"):
+            st.code(st.session_state.profile_report, language=None)
 
 # Auto-refresh logic
 if auto_refresh:
     time.sleep(refresh_interval)
-    updates = st.session_state.network_builder.update_network()
-    st.session_state.last_update = datetime.now()
-    if updates:
-        st.session_state.update_history_data.extend(updates)
+    # In multi-network mode each network follows its own update interval
+    refresh_networks(due_only=True)
     st.rerun()
\ No newline at end of file
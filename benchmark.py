@@ -0,0 +1,769 @@
+# benchmark.py
+# Offline benchmark suite for the simulator, metrics and visualizer.
+#
+# Usage:
+#   python benchmark.py                                  # run default sizes
+#   python benchmark.py --sizes 1000 10000 --repeat 5
+#   python benchmark.py --save-baseline benchmark_baseline.json
+#   python benchmark.py --baseline benchmark_baseline.json --threshold 0.25
+#   python benchmark.py --startup                        # dashboard cold start
+#   python benchmark.py --overhead                       # instrumentation cost
+#   python benchmark.py --verify-stream-stats            # sketches vs exact counts
+#   python benchmark.py --verify-kcore                   # incremental vs full k-core
+#   python benchmark.py --multi-network --networks 4 8 --workers 0 1 2 4
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import networkx as nx
+
+import config
+import kcore
+from data_simulator import DataSimulator
+from kcore import IncrementalCoreDecomposition
+from metrics_calculator import MetricsCalculator
+from network_builder import NetworkBuilder
+from network_registry import NetworkRegistry
+from performance import (OVERHEAD_LIMIT, PerformanceMonitor, estimate_overhead,
+                         use_monitor)
+from visualizer import NetworkVisualizer
+
+NETWORK_TYPES = ["barabasi_albert", "erdos_renyi", "watts_strogatz"]
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+UPDATES_PER_RUN = 100
+OVERHEAD_EDGES = 300  # About the size of the default dashboard network
+VERIFY_UPDATES = 500
+MULTI_NETWORK_COUNTS = [4, 8]
+MULTI_NETWORK_WORKERS = [0, 1, 2, 4]  # 0 evaluates in-process (the reference)
+MULTI_NETWORK_EDGES = 2_000  # Per network
+DISTINCT_ERROR_LIMIT = 0.10  # Mean relative error of the distinct-peer estimates
+KCORE_TRIALS = 40
+KCORE_STEPS = 600  # Random updates per trial
+KCORE_LABEL_GAPS = [kcore.LABEL_GAP, 2]  # 2 forces frequent relabelling
+
+# Largest edge count each operation is run at by default. The slow
+# algorithms (betweenness, greedy modularity, Kamada-Kawai, ...) would take
+# hours on the bigger graphs; use --no-limits to run everything anyway.
+OPERATION_EDGE_LIMITS = {
+    'initialize': None,
+    'update_throughput': None,
+    'centrality_degree': None,
+    'centrality_betweenness': 10_000,
+    'centrality_closeness': 10_000,
+    'centrality_eigenvector': 100_000,
+    'centrality_all': 10_000,
+    'communities': 10_000,
+    'modularity': 10_000,
+    'diameter': 10_000,
+    'core_numbers': None,
+    'core_incremental': None,
+    'all_metrics': 10_000,
+    'layout_spring': 10_000,
+    'layout_circular': None,
+    'layout_kamada_kawai': 1_000,
+    'figure_build': 100_000,
+}
+
+
+def nodes_for_edges(network_type, num_edges):
+    """Node count that makes DataSimulator produce roughly num_edges edges"""
+    if network_type == "erdos_renyi":
+        # E = p * n * (n - 1) / 2 with p = 0.1
+        return max(int(math.ceil((1 + math.sqrt(1 + 80 * num_edges)) / 2)), 2)
+    if network_type == "watts_strogatz":
+        # E = n * k / 2 with k = 6
+        return max(num_edges // 3, 7)
+    # Barabasi-Albert: E = (n - m) * m with m = 3
+    return max(num_edges // 3 + 3, 4)
+
+
+def build_network(network_type, num_edges):
+    """Generate a benchmark network with a fixed seed"""
+    random.seed(42)
+    simulator = DataSimulator(
+        num_nodes=nodes_for_edges(network_type, num_edges),
+        network_type=network_type
+    )
+    return simulator, simulator.generate_initial_network()
+
+
+def _largest_component(G):
+    """Return G itself if connected, otherwise its largest component"""
+    if nx.is_connected(G):
+        return G
+    return G.subgraph(max(nx.connected_components(G), key=len)).copy()
+
+
+def make_operations(network_type, num_edges):
+    """Return (nodes, edges, {name: (setup, run)}) for one network.
+
+    The network is generated once; setup() builds the input for a run
+    outside of the timed region and run(state) performs the operation.
+    """
+    simulator, base = build_network(network_type, num_edges)
+
+    def network_setup():
+        return base.copy()
+
+    def simulator_setup():
+        return simulator, base.copy()
+
+    def layout_setup():
+        return NetworkVisualizer(network_setup())
+
+    def figure_setup():
+        visualizer = layout_setup()
+        return {
+            'visualizer': visualizer,
+            'pos': visualizer.compute_layout('circular'),
+            'communities': {node: node % 12 for node in visualizer.G.nodes()},
+            'centrality': nx.degree_centrality(visualizer.G),
+        }
+
+    def run_update(state):
+        simulator, G = state
+        for _ in range(UPDATES_PER_RUN):
+            simulator.simulate_update(G, add_edges=1, remove_edges=1)
+
+    def core_setup():
+        # Record the update events up front so only core maintenance is timed
+        simulator, G = simulator_setup()
+        updates = []
+        for _ in range(UPDATES_PER_RUN):
+            updates.extend(simulator.simulate_update(G, add_edges=1, remove_edges=1))
+        G = network_setup()
+        return G, updates, IncrementalCoreDecomposition(G)
+
+    def run_core_incremental(state):
+        G, updates, cores = state
+        for update in updates:
+            if update['type'] == 'add':
+                G.add_edge(update['node1'], update['node2'])
+            else:
+                G.remove_edge(update['node1'], update['node2'])
+            cores.apply_update(update)
+
+    def run_figure(state):
+        state['visualizer'].create_plotly_network(
+            community_dict=state['communities'],
+            centrality_dict=state['centrality'],
+            show_labels=False,
+            pos=state['pos']
+        )
+
+    operations = {
+        'initialize': (
+            lambda: DataSimulator(
+                num_nodes=nodes_for_edges(network_type, num_edges),
+                network_type=network_type
+            ),
+            lambda simulator: simulator.generate_initial_network()
+        ),
+        'update_throughput': (simulator_setup, run_update),
+        'centrality_degree': (network_setup, nx.degree_centrality),
+        'centrality_betweenness': (network_setup, nx.betweenness_centrality),
+        'centrality_closeness': (
+            lambda: _largest_component(network_setup()),
+            nx.closeness_centrality
+        ),
+        'centrality_eigenvector': (
+            network_setup,
+            lambda G: nx.eigenvector_centrality(G, max_iter=1000)
+        ),
+        'centrality_all': (
+            lambda: MetricsCalculator(network_setup()),
+            lambda calc: calc.calculate_centrality_metrics(force_recalculate=True)
+        ),
+        'communities': (
+            lambda: MetricsCalculator(network_setup()),
+            lambda calc: calc.detect_communities(force_recalculate=True)
+        ),
+        'modularity': (
+            lambda: MetricsCalculator(network_setup()),
+            lambda calc: calc.calculate_modularity()
+        ),
+        'diameter': (
+            lambda: _largest_component(network_setup()),
+            nx.diameter
+        ),
+        'core_numbers': (
+            lambda: MetricsCalculator(network_setup()),
+            lambda calc: calc.calculate_core_numbers(force_recalculate=True)
+        ),
+        'core_incremental': (core_setup, run_core_incremental),
+        'all_metrics': (
+            lambda: MetricsCalculator(network_setup()),
+            lambda calc: calc.get_all_metrics()
+        ),
+        'layout_spring': (layout_setup, lambda v: v.compute_layout('spring')),
+        'layout_circular': (layout_setup, lambda v: v.compute_layout('circular')),
+        'layout_kamada_kawai': (
+            layout_setup,
+            lambda v: v.compute_layout('kamada_kawai')
+        ),
+        'figure_build': (figure_setup, run_figure),
+    }
+    return base.number_of_nodes(), base.number_of_edges(), operations
+
+
+def time_operation(setup, run, repeat):
+    """Time run() on fresh setup() state; returns a list of seconds"""
+    timings = []
+    for _ in range(repeat):
+        random.seed(42)
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def peak_memory(setup, run):
+    """Peak Python heap allocation (bytes) of a single run()"""
+    random.seed(42)
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(sizes, network_types, operations=None, repeat=3,
+                   measure_memory=True, use_limits=True, log=None):
+    """Run the suite and return a list of result records"""
+    results = []
+    for network_type in network_types:
+        for num_edges in sizes:
+            nodes, edges, ops = make_operations(network_type, num_edges)
+            for name, (setup, run) in ops.items():
+                if operations and name not in operations:
+                    continue
+                record = {
+                    'network_type': network_type,
+                    'target_edges': num_edges,
+                    'nodes': nodes,
+                    'edges': edges,
+                    'operation': name,
+                }
+                limit = OPERATION_EDGE_LIMITS.get(name)
+                if use_limits and limit is not None and num_edges > limit:
+                    record['skipped'] = f"above {limit} edge limit"
+                    results.append(record)
+                    continue
+
+                try:
+                    timings = time_operation(setup, run, repeat)
+                except Exception as e:
+                    record['error'] = f"{type(e).__name__}: {e}"
+                    results.append(record)
+                    if log:
+                        log(record)
+                    continue
+                record.update({
+                    'repeat': repeat,
+                    'min_s': min(timings),
+                    'median_s': statistics.median(timings),
+                    'max_s': max(timings),
+                })
+                if name == 'update_throughput':
+                    record['updates_per_s'] = UPDATES_PER_RUN / record['median_s']
+                if measure_memory:
+                    record['peak_memory_bytes'] = peak_memory(setup, run)
+                results.append(record)
+                if log:
+                    log(record)
+    return results
+
+
+# Runs the dashboard headlessly in a fresh interpreter and reports how long
+# the first (cold) and second (warm) script runs take and the peak RSS.
+_STARTUP_SNIPPET = """
+import json, resource, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.run()
+cold = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({
+    'cold_start_s': cold,
+    'rerun_s': rerun,
+    'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    'exceptions': [str(e.value) for e in at.exception]
+}))
+"""
+
+
+def measure_startup(script='app.py', repeat=3):
+    """Measure dashboard cold start, warm rerun and peak RSS"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', _STARTUP_SNIPPET, script],
+            capture_output=True, text=True, check=True
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample['process_s'] = time.perf_counter() - start
+        samples.append(sample)
+    return {
+        'script': script,
+        'repeat': repeat,
+        'process_s': statistics.median(s['process_s'] for s in samples),
+        'cold_start_s': statistics.median(s['cold_start_s'] for s in samples),
+        'rerun_s': statistics.median(s['rerun_s'] for s in samples),
+        'max_rss_bytes': max(s['max_rss_bytes'] for s in samples),
+        'exceptions': samples[-1]['exceptions'],
+    }
+
+
+def _render_workload(G):
+    """The metrics and figure work of one dashboard render"""
+    metrics_calc = MetricsCalculator(G)
+    metrics_calc.get_all_metrics()
+    NetworkVisualizer(G).create_plotly_network(
+        community_dict=metrics_calc.detect_communities(),
+        centrality_dict=metrics_calc.calculate_centrality('degree'),
+        show_labels=False
+    )
+
+
+def measure_overhead(network_type, num_edges, repeat=30):
+    """Render workload time with instrumentation disabled vs enabled.
+
+    Runs alternate so drift affects both sides equally. Also reports the
+    estimate the dashboard shows: instrumentation calls x calibrated cost.
+    """
+    _, G = build_network(network_type, num_edges)
+    timings = {False: [], True: []}
+    calls = 0
+    try:
+        for i in range(repeat + 1):
+            for enabled in (False, True):
+                selected = PerformanceMonitor(enabled=enabled)
+                use_monitor(selected)
+                start = time.perf_counter()
+                _render_workload(G)
+                elapsed = time.perf_counter() - start
+                if i > 0:  # First round warms caches and imports
+                    timings[enabled].append(elapsed)
+                if enabled:
+                    calls = selected.calls
+    finally:
+        use_monitor(PerformanceMonitor())
+    disabled_s = statistics.median(timings[False])
+    enabled_s = statistics.median(timings[True])
+    return {
+        'network_type': network_type,
+        'nodes': G.number_of_nodes(),
+        'edges': G.number_of_edges(),
+        'repeat': repeat,
+        'disabled_s': disabled_s,
+        'enabled_s': enabled_s,
+        'measured_overhead': enabled_s / disabled_s - 1,
+        'calls_per_render': calls,
+        'estimated_overhead': estimate_overhead(calls, disabled_s),
+        'limit': OVERHEAD_LIMIT,
+    }
+
+
+def measure_multi_network(num_networks, max_workers, num_edges, repeat=3):
+    """Time NetworkRegistry.get_summary() after updating every network.
+
+    The networks cycle through NETWORK_TYPES. The first call also starts
+    the worker pool and is reported separately; max_workers=0 evaluates
+    in-process.
+    """
+    random.seed(42)
+    registry = NetworkRegistry(max_workers=max_workers)
+    for i in range(num_networks):
+        network_type = NETWORK_TYPES[i % len(NETWORK_TYPES)]
+        registry.add_network(
+            f"net{i}",
+            num_nodes=nodes_for_edges(network_type, num_edges),
+            network_type=network_type,
+            seed=i
+        )
+    timings = []
+    for _ in range(repeat + 1):
+        registry.update_all()  # Every network is stale again
+        start = time.perf_counter()
+        registry.get_summary()
+        timings.append(time.perf_counter() - start)
+    return {
+        'networks': num_networks,
+        'max_workers': max_workers,
+        'edges_per_network': sum(
+            registry.get_builder(name).G.number_of_edges() for name in registry.names()
+        ) // num_networks,
+        'repeat': repeat,
+        'first_s': timings[0],
+        'median_s': statistics.median(timings[1:]),
+    }
+
+
+def verify_stream_stats(name, settings, updates=VERIFY_UPDATES, top_k=10):
+    """Compare StreamingStatistics against exact counts for one network.
+
+    Replays the updates of a NetworkBuilder built from settings (a
+    config.NETWORKS entry) and checks the distinct-peer estimates and the
+    Space-Saving bounds: count - error <= exact count <= count.
+    """
+    builder = NetworkBuilder(
+        num_nodes=settings.get('num_nodes'),
+        network_type=settings.get('network_type'),
+        seed=settings.get('seed', 42),
+        edges_to_add=settings.get('edges_to_add'),
+        edges_to_remove=settings.get('edges_to_remove')
+    )
+    builder.initialize_network()
+    for _ in range(updates):
+        builder.update_network()
+
+    peers, counts = {}, {}
+    for update in builder.update_history:
+        if update['type'] != 'add':
+            continue
+        for node, neighbour in ((update['node1'], update['node2']),
+                                (update['node2'], update['node1'])):
+            peers.setdefault(node, set()).add(neighbour)
+            counts[node] = counts.get(node, 0) + 1
+
+    stats = builder.stream_stats
+    errors = [abs(stats.distinct_neighbours(node) - len(p)) / len(p)
+              for node, p in peers.items()]
+    hitters = stats.get_heavy_hitters()
+    bounds_ok = all(
+        h['guaranteed_connections'] <= counts.get(h['node'], 0) <= h['new_connections']
+        for h in hitters
+    )
+    exact_top = sorted(counts.values(), reverse=True)[:top_k]
+    guaranteed_top = [h['guaranteed_connections'] for h in hitters[:top_k]]
+    return {
+        'network': name,
+        'nodes': builder.G.number_of_nodes(),
+        'updates': updates,
+        'distinct_mean_error': statistics.mean(errors),
+        'distinct_max_error': max(errors),
+        'heavy_hitter_bounds_ok': bounds_ok,
+        'guaranteed_top': guaranteed_top,
+        'exact_top': exact_top,
+        'memory_bytes': stats.memory_bytes(),
+        'ok': (statistics.mean(errors) <= DISTINCT_ERROR_LIMIT and bounds_ok
+               and guaranteed_top == exact_top),
+    }
+
+
+def _kcore_state_ok(decomposition):
+    """Check deg+ (later neighbours in the k-order) and the shell links"""
+    G = decomposition.G
+    for node in G:
+        later = sum(1 for x in G.adj[node] if decomposition._precedes(node, x))
+        if later != decomposition.deg_plus[node] or later > decomposition.core[node]:
+            return False
+    return None not in decomposition.next
+
+
+def verify_kcore(label_gap, trials=KCORE_TRIALS, steps=KCORE_STEPS, seed=0):
+    """Compare IncrementalCoreDecomposition with nx.core_number.
+
+    Random networks (10-60 nodes, every type) get steps random updates of
+    0-3 added and 0-3 removed edges each; the core numbers are compared
+    after every update. A last trial grows a graph from empty. Returns
+    the number of updates checked and the failures found.
+    """
+    original_gap = kcore.LABEL_GAP
+    kcore.LABEL_GAP = label_gap
+    random.seed(seed)
+    failures = []
+    checked = 0
+    try:
+        for trial in range(trials):
+            network_type = random.choice(NETWORK_TYPES)
+            simulator = DataSimulator(num_nodes=random.randint(10, 60),
+                                      network_type=network_type)
+            G = simulator.generate_initial_network()
+            decomposition = IncrementalCoreDecomposition(G)
+            for step in range(steps):
+                simulator.simulate_update(
+                    G, add_edges=random.randint(0, 3), remove_edges=random.randint(0, 3),
+                    on_update=decomposition.apply_update
+                )
+                checked += 1
+                if decomposition.core != nx.core_number(G) or (
+                        step % 25 == 0 and not _kcore_state_ok(decomposition)):
+                    failures.append({'trial': trial, 'network_type': network_type,
+                                     'step': step})
+                    break
+
+        G = nx.Graph()
+        decomposition = IncrementalCoreDecomposition(G)
+        for _ in range(500):
+            u, v = random.sample(range(40), 2)
+            if not G.has_edge(u, v):
+                G.add_edge(u, v)
+                decomposition.add_edge(u, v)
+                checked += 1
+        if decomposition.core != nx.core_number(G) or not _kcore_state_ok(decomposition):
+            failures.append({'trial': 'grow_from_empty'})
+    finally:
+        kcore.LABEL_GAP = original_gap
+    return {'label_gap': label_gap, 'updates_checked': checked, 'failures': failures}
+
+
+def result_key(record):
+    return (record['network_type'], record['target_edges'], record['operation'])
+
+
+def compare_to_baseline(results, baseline, time_threshold=0.25,
+                        memory_threshold=0.25):
+    """Return a list of regressions relative to the baseline results"""
+    baseline_by_key = {
+        result_key(r): r for r in baseline.get('results', []) if 'median_s' in r
+    }
+    regressions = []
+    for record in results:
+        old = baseline_by_key.get(result_key(record))
+        if old is None:
+            continue
+        if 'error' in record:
+            # Worked in the baseline, fails now
+            regressions.append({
+                'network_type': record['network_type'],
+                'target_edges': record['target_edges'],
+                'operation': record['operation'],
+                'field': 'error',
+                'baseline': old['median_s'],
+                'current': record['error'],
+                'ratio': None,
+            })
+            continue
+        if 'median_s' not in record:
+            continue
+        checks = [('median_s', time_threshold), ('peak_memory_bytes', memory_threshold)]
+        for field, threshold in checks:
+            if field not in record or not old.get(field):
+                continue
+            ratio = record[field] / old[field]
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'network_type': record['network_type'],
+                    'target_edges': record['target_edges'],
+                    'operation': record['operation'],
+                    'field': field,
+                    'baseline': old[field],
+                    'current': record[field],
+                    'ratio': ratio,
+                })
+    return regressions
+
+
+def environment_info():
+    """Describe the machine the benchmark ran on"""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'networkx': nx.__version__,
+    }
+
+
+def _print_record(record):
+    if 'error' in record:
+        print(f"{record['network_type']:16} {record['target_edges']:>9} "
+              f"{record['operation']:24} ERROR {record['error']}", flush=True)
+        return
+    mem = record.get('peak_memory_bytes')
+    mem_text = f"{mem / 1e6:9.1f} MB" if mem is not None else ""
+    print(f"{record['network_type']:16} {record['target_edges']:>9} "
+          f"{record['operation']:24} {record['median_s'] * 1000:12.2f} ms {mem_text}",
+          flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Network dashboard benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help="Target edge counts (default: 1k 10k 100k 1M, "
+                             "300 with --overhead, 2k per network with "
+                             "--multi-network)")
+    parser.add_argument('--types', nargs='+', default=NETWORK_TYPES,
+                        choices=NETWORK_TYPES, help="Network types to generate")
+    parser.add_argument('--operations', nargs='+', default=None,
+                        choices=sorted(OPERATION_EDGE_LIMITS),
+                        help="Only run these operations")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Timed runs per operation (median is reported)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument('--no-limits', action='store_true',
+                        help="Run slow operations at every size")
+    parser.add_argument('--startup', action='store_true',
+                        help="Only measure dashboard cold start (needs streamlit)")
+    parser.add_argument('--overhead', action='store_true',
+                        help="Only measure instrumentation overhead on a render workload")
+    parser.add_argument('--multi-network', action='store_true',
+                        help="Only time the multi-network summary across "
+                             "network and worker counts")
+    parser.add_argument('--networks', type=int, nargs='+', default=MULTI_NETWORK_COUNTS,
+                        help="Network counts for --multi-network (default: 4 8)")
+    parser.add_argument('--workers', type=int, nargs='+', default=MULTI_NETWORK_WORKERS,
+                        help="Worker counts for --multi-network, 0 = in-process "
+                             "(default: 0 1 2 4)")
+    parser.add_argument('--verify-stream-stats', action='store_true',
+                        help="Only check the streaming sketches against exact "
+                             "counts on the configured networks")
+    parser.add_argument('--verify-kcore', action='store_true',
+                        help="Only check incremental core numbers against a "
+                             "full recomputation on random updates")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="Where to write the JSON results")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', help="Also write results as a baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed relative slowdown before failing (default: 0.25)")
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help="Allowed relative peak-memory growth (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        startup = measure_startup(repeat=args.repeat)
+        print(f"cold start {startup['cold_start_s'] * 1000:.0f} ms, "
+              f"rerun {startup['rerun_s'] * 1000:.0f} ms, "
+              f"process {startup['process_s'] * 1000:.0f} ms, "
+              f"peak RSS {startup['max_rss_bytes'] / 1e6:.1f} MB")
+        for error in startup['exceptions']:
+            print(f"APP ERROR {error}")
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'startup': startup}, f, indent=2)
+        return 1 if startup['exceptions'] else 0
+
+    if args.overhead:
+        records = []
+        for network_type in args.types:
+            for num_edges in args.sizes or [OVERHEAD_EDGES]:
+                record = measure_overhead(network_type, num_edges,
+                                          repeat=max(args.repeat, 30))
+                records.append(record)
+                print(f"{network_type:16} {record['edges']:>9} "
+                      f"off {record['disabled_s'] * 1000:8.2f} ms  "
+                      f"on {record['enabled_s'] * 1000:8.2f} ms  "
+                      f"measured {record['measured_overhead']:+.2%}  "
+                      f"estimated {record['estimated_overhead']:.3%} "
+                      f"({record['calls_per_render']} calls)", flush=True)
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'overhead': records}, f, indent=2)
+        # The estimate is deterministic; the A/B difference is within timing noise
+        over = [r for r in records if r['estimated_overhead'] > OVERHEAD_LIMIT]
+        for r in over:
+            print(f"OVERHEAD {r['network_type']} {r['edges']}: "
+                  f"{r['estimated_overhead']:.2%} > {OVERHEAD_LIMIT:.0%}")
+        return 1 if over else 0
+
+    if args.multi_network:
+        records = []
+        for num_edges in args.sizes or [MULTI_NETWORK_EDGES]:
+            for num_networks in args.networks:
+                reference = None
+                for max_workers in args.workers:
+                    record = measure_multi_network(num_networks, max_workers, num_edges,
+                                                   repeat=args.repeat)
+                    if max_workers == 0:
+                        reference = record['median_s']
+                    record['speedup'] = reference / record['median_s'] if reference else None
+                    records.append(record)
+                    speedup = (f"{record['speedup']:5.2f}x" if record['speedup'] is not None
+                               else "")
+                    print(f"{num_networks:3} networks x {record['edges_per_network']:>7} edges  "
+                          f"workers {max_workers:2}  "
+                          f"first {record['first_s'] * 1000:9.1f} ms  "
+                          f"median {record['median_s'] * 1000:9.1f} ms  {speedup}",
+                          flush=True)
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'multi_network': records}, f, indent=2)
+        return 0
+
+    if args.verify_kcore:
+        records = []
+        for label_gap in KCORE_LABEL_GAPS:
+            record = verify_kcore(label_gap)
+            records.append(record)
+            print(f"label gap {label_gap:>10}  {record['updates_checked']} updates  "
+                  f"{'ok' if not record['failures'] else 'FAILED'}", flush=True)
+            for failure in record['failures']:
+                print(f"MISMATCH {failure}")
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'kcore': records}, f, indent=2)
+        return 1 if any(r['failures'] for r in records) else 0
+
+    if args.verify_stream_stats:
+        networks = {'default': {}, **config.NETWORKS}
+        records = []
+        for name, settings in networks.items():
+            record = verify_stream_stats(name, settings)
+            records.append(record)
+            print(f"{name:16} {record['nodes']:>6} nodes  "
+                  f"distinct error mean {record['distinct_mean_error']:6.1%} "
+                  f"max {record['distinct_max_error']:6.1%}  "
+                  f"top guaranteed {record['guaranteed_top'][:5]} "
+                  f"exact {record['exact_top'][:5]}  "
+                  f"{'ok' if record['ok'] else 'FAILED'}", flush=True)
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'stream_stats': records}, f, indent=2)
+        return 0 if all(r['ok'] for r in records) else 1
+
+    results = run_benchmarks(
+        args.sizes or DEFAULT_SIZES, args.types,
+        operations=args.operations,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+        use_limits=not args.no_limits,
+        log=_print_record
+    )
+    report = {'environment': environment_info(), 'results': results}
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(
+            results, baseline, args.threshold, args.memory_threshold
+        )
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+        for r in regressions:
+            change = r['current'] if r['ratio'] is None else f"x{r['ratio']:.2f}"
+            print(f"REGRESSION {r['network_type']} {r['target_edges']} "
+                  f"{r['operation']} {r['field']}: {change}")
+        if regressions:
+            exit_code = 1
+        else:
+            print("No regressions against baseline")
+
+    errors = [r for r in results if 'error' in r]
+    if errors:
+        print(f"{len(errors)} operation(s) failed")
+        exit_code = 1
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
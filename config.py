@@ -19,3 +19,29 @@ LAYOUT_ITERATIONS = 50
 # Metrics calculation
 CALCULATE_BETWEENNESS = True  # Set False for large networks (>1000 nodes)
 TOP_K_NODES = 10
+
+# Streaming statistics (fixed memory regardless of event volume)
+SKETCH_WIDTH = 1024  # Count-Min sketch columns
+SKETCH_DEPTH = 4  # Count-Min sketch rows (hash functions)
+HEAVY_HITTERS_CAPACITY = 256  # Nodes tracked by Space-Saving
+HLL_PRECISION = 7  # HyperLogLog uses 2**precision registers per node
+DISTINCT_SKETCH_NODES = 256  # Nodes per sub-window with their own HyperLogLog
+DISTINCT_SKETCH_WIDTH = 256  # Shared HyperLogLog table for any further nodes: columns
+DISTINCT_SKETCH_DEPTH = 2  # Shared HyperLogLog table rows (hash functions)
+DISTINCT_WINDOW_SECONDS = 3600  # Window for distinct-neighbour counts
+DISTINCT_WINDOW_BUCKETS = 6  # Sub-windows the window slides by
+SPIKE_DECAY = 0.99  # Per-update decay of the degree-spike baseline (~100 updates)
+SPIKE_WINDOW = 5  # Updates whose new connections are compared to the baseline
+SPIKE_THRESHOLD = 3.0  # Alert when recent connections exceed threshold x expected
+SPIKE_MIN_EVENTS = 3  # Ignore spikes with fewer recent connections than this
+
+# Multi-network monitoring: name -> generator and update settings.
+# Missing keys fall back to the single-network settings above.
+NETWORKS = {
+    "backbone": {"num_nodes": 200, "network_type": "barabasi_albert", "update_interval": 5},
+    "campus": {"num_nodes": 150, "network_type": "watts_strogatz", "update_interval": 10},
+    "iot": {"num_nodes": 120, "network_type": "erdos_renyi", "update_interval": 2,
+            "edges_to_add": 3, "edges_to_remove": 1},
+    "partners": {"num_nodes": 80, "network_type": "barabasi_albert", "seed": 7, "update_interval": 30},
+}
+METRICS_WORKERS = None  # Process pool size for multi-network metrics (None = CPU count, 0 = no pool)
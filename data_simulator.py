@@ -2,26 +2,26 @@
 import networkx as nx
 import random
 from datetime import datetime, timedelta
-import numpy as np
 
 class DataSimulator:
     """Simulates live network data updates"""
     
-    def __init__(self, num_nodes=100, network_type="barabasi_albert"):
+    def __init__(self, num_nodes=100, network_type="barabasi_albert", seed=42):
         self.num_nodes = num_nodes
         self.network_type = network_type
+        self.seed = seed
         self.update_count = 0
         
     def generate_initial_network(self):
         """Generate initial network based on type"""
         if self.network_type == "barabasi_albert":
-            G = nx.barabasi_albert_graph(self.num_nodes, 3, seed=42)
+            G = nx.barabasi_albert_graph(self.num_nodes, 3, seed=self.seed)
         elif self.network_type == "erdos_renyi":
-            G = nx.erdos_renyi_graph(self.num_nodes, 0.1, seed=42)
+            G = nx.erdos_renyi_graph(self.num_nodes, 0.1, seed=self.seed)
         elif self.network_type == "watts_strogatz":
-            G = nx.watts_strogatz_graph(self.num_nodes, 6, 0.3, seed=42)
+            G = nx.watts_strogatz_graph(self.num_nodes, 6, 0.3, seed=self.seed)
         else:
-            G = nx.barabasi_albert_graph(self.num_nodes, 3, seed=42)
+            G = nx.barabasi_albert_graph(self.num_nodes, 3, seed=self.seed)
         
         # Add timestamps to edges
         for edge in G.edges():
@@ -31,8 +31,12 @@ class DataSimulator:
         
         return G
     
-    def simulate_update(self, G, add_edges=1, remove_edges=0):
-        """Simulate a network update by adding/removing edges"""
+    def simulate_update(self, G, add_edges=1, remove_edges=0, on_update=None):
+        """Simulate a network update by adding/removing edges
+
+        on_update, if given, is called with each update right after G
+        was changed, so listeners see the graph in the matching state.
+        """
         updates = []
         nodes = list(G.nodes())
         
@@ -57,6 +61,8 @@ class DataSimulator:
                     'node2': node2,
                     'timestamp': datetime.now()
                 })
+                if on_update is not None:
+                    on_update(updates[-1])
             attempts += 1
         
         # Remove edges (optional)
@@ -71,6 +77,8 @@ class DataSimulator:
                     'node2': edge[1],
                     'timestamp': datetime.now()
                 })
+                if on_update is not None:
+                    on_update(updates[-1])
                 edges.remove(edge)
         
         self.update_count += 1
@@ -0,0 +1,296 @@
+# kcore.py
+# Incremental k-core decomposition under edge insertions and removals
+import heapq
+
+LABEL_GAP = 1 << 32  # Spacing of order labels; halved by each insertion in between
+
+
+class IncrementalCoreDecomposition:
+    """Keeps the core number of every node up to date as edges change.
+
+    The full decomposition (O(E)) is only computed on reset(). It also
+    records the order in which peeling removes the nodes (the k-order) and
+    for each node deg+, its neighbours later in that order; every node has
+    deg+ <= core. An inserted edge only raises deg+ of its earlier end
+    point, so most insertions stop right there. Otherwise only nodes
+    reachable forwards in the k-order are visited, in order, following the
+    order-based algorithm of Zhang et al. (ICDE 2017). Removals evict the
+    nodes left with too few neighbours in their core and move them to the
+    end of the next lower shell.
+
+    add_edge()/remove_edge() must be called right after the edge was
+    added to or removed from the graph.
+    """
+
+    def __init__(self, G):
+        self.reset(G)
+
+    def reset(self, G):
+        """Recompute all core numbers and the k-order from scratch"""
+        self.G = G
+        self.core, order = _peel(G)
+        # Each shell is a linked list of nodes; labels give O(1) comparisons
+        self.label = {}
+        self.next = {}
+        self.prev = {}
+        self.head = {}  # core number -> first node of the shell
+        self.tail = {}  # core number -> last node of the shell
+        for node in order:
+            self._append(node, self.core[node])
+        self.deg_plus = {
+            node: sum(1 for x in G.adj[node] if self._precedes(node, x))
+            for node in G
+        }
+
+    def add_edge(self, u, v):
+        """Update core numbers after edge (u, v) was inserted"""
+        self._add_node(u)
+        self._add_node(v)
+        if not self._precedes(u, v):
+            u, v = v, u
+        core, label, adj, deg_plus = self.core, self.label, self.G.adj, self.deg_plus
+        k = core[u]
+        deg_plus[u] += 1
+        if deg_plus[u] <= k:
+            return  # The k-order is still a valid peeling order
+
+        # Visit shell k in k-order from u. A node becomes a candidate for
+        # core k + 1 when its later neighbours (deg+) plus its candidate
+        # neighbours before it (deg*) exceed k; candidates leave the shell
+        deg_star = {}
+        candidates = {}  # node -> rank in candidate order
+        rank = 0
+        heap = [(label[u], u)]
+        queued = {u}
+        while heap:
+            _, w = heapq.heappop(heap)
+            queued.discard(w)
+            star = deg_star.get(w, 0)
+            if star + deg_plus[w] > k:
+                candidates[w] = rank
+                rank += 1
+                self._unlink(w, k)
+                for x in adj[w]:
+                    if core[x] == k and x not in candidates and label[x] > label[w]:
+                        deg_star[x] = deg_star.get(x, 0) + 1
+                        if x not in queued:
+                            queued.add(x)
+                            heapq.heappush(heap, (label[x], x))
+            elif star:
+                # w stays in shell k, ahead of the candidates before it
+                deg_plus[w] += star
+                deg_star[w] = 0
+                if self._remove_candidates(w, k, candidates, deg_star):
+                    heap = [(label[x], x) for x in queued]
+                    heapq.heapify(heap)
+
+        if candidates:
+            for w in candidates:
+                core[w] = k + 1
+            self._prepend(list(candidates), k + 1)
+
+    def _remove_candidates(self, w, k, candidates, deg_star):
+        # w stayed in shell k, so candidates next to it lost a later
+        # neighbour; place those that no longer qualify right after w.
+        # Returns True if shell k had to be relabelled
+        core, label, adj, deg_plus = self.core, self.label, self.G.adj, self.deg_plus
+        stack = []
+        for x in adj[w]:
+            if x in candidates:
+                deg_plus[x] -= 1
+                if deg_plus[x] + deg_star.get(x, 0) <= k:
+                    stack.append(x)
+        relabelled = False
+        last = w
+        while stack:
+            x = stack.pop()
+            if x not in candidates:
+                continue
+            rank = candidates.pop(x)
+            for y in adj[x]:
+                if core[y] != k:
+                    continue
+                if y in candidates:
+                    if candidates[y] > rank:
+                        deg_star[y] -= 1
+                    else:
+                        deg_plus[y] -= 1
+                    if deg_plus[y] + deg_star.get(y, 0) <= k:
+                        stack.append(y)
+                elif label[y] > label[last]:
+                    # Not visited yet; x now precedes it inside shell k
+                    deg_star[y] -= 1
+            deg_plus[x] += deg_star.get(x, 0)
+            deg_star[x] = 0
+            relabelled |= self._insert_after(x, last, k)
+            last = x
+        return relabelled
+
+    def remove_edge(self, u, v):
+        """Update core numbers after edge (u, v) was removed"""
+        adj, core = self.G.adj, self.core
+        if u not in core or v not in core:
+            return
+        if not self._precedes(u, v):
+            u, v = v, u
+        self.deg_plus[u] -= 1
+        r = core[u]
+        if r == 0:
+            return
+
+        # Evict nodes left with fewer than r neighbours in the r-core and
+        # propagate only to neighbours that may lose their place as well
+        cd = {}
+        evicted = []
+        stack = [w for w in (u, v) if core[w] == r]
+        while stack:
+            w = stack.pop()
+            if core[w] != r:
+                continue
+            if w not in cd:
+                cd[w] = sum(1 for x in adj[w] if core[x] >= r)
+            if cd[w] < r:
+                core[w] = r - 1
+                evicted.append(w)
+                for x in adj[w]:
+                    if core[x] == r:
+                        if x in cd:
+                            cd[x] -= 1
+                        stack.append(x)
+        if not evicted:
+            return
+
+        # Evicted nodes move to the end of shell r - 1 in eviction order,
+        # ahead of the shell-r neighbours that counted them in deg+
+        label, deg_plus = self.label, self.deg_plus
+        for w in evicted:
+            for x in adj[w]:
+                if core[x] == r and label[x] < label[w]:
+                    deg_plus[x] -= 1
+        for w in evicted:
+            self._unlink(w, r)
+            self._append(w, r - 1)
+        for w in evicted:
+            deg_plus[w] = sum(1 for x in adj[w] if self._precedes(w, x))
+
+    def apply_update(self, update):
+        """Apply one update event from DataSimulator.simulate_update"""
+        if update['type'] == 'add':
+            self.add_edge(update['node1'], update['node2'])
+        elif update['type'] == 'remove':
+            self.remove_edge(update['node1'], update['node2'])
+
+    def get_core_numbers(self):
+        """Return a copy of the current core numbers"""
+        return dict(self.core)
+
+    def max_core(self):
+        """Largest core number (degeneracy of the graph)"""
+        return max(self.core.values(), default=0)
+
+    def _precedes(self, a, b):
+        # Shells are ordered by core number, nodes within a shell by label
+        core_a, core_b = self.core[a], self.core[b]
+        return core_a < core_b or (core_a == core_b and self.label[a] < self.label[b])
+
+    def _add_node(self, node):
+        if node not in self.core:
+            self.core[node] = 0
+            self.deg_plus[node] = 0
+            self._append(node, 0)
+
+    def _append(self, node, k):
+        tail = self.tail.get(k)
+        self.prev[node] = tail
+        self.next[node] = None
+        if tail is None:
+            self.head[k] = node
+            self.label[node] = 0
+        else:
+            self.next[tail] = node
+            self.label[node] = self.label[tail] + LABEL_GAP
+        self.tail[k] = node
+
+    def _prepend(self, nodes, k):
+        head = self.head.get(k)
+        if head is None:
+            for node in nodes:
+                self._append(node, k)
+            return
+        label = self.label[head] - LABEL_GAP * len(nodes)
+        prev = None
+        for node in nodes:
+            self.label[node] = label
+            label += LABEL_GAP
+            self.prev[node] = prev
+            if prev is None:
+                self.head[k] = node
+            else:
+                self.next[prev] = node
+            prev = node
+        self.next[prev] = head
+        self.prev[head] = prev
+
+    def _insert_after(self, node, after, k):
+        # Returns True if the shell ran out of labels and was relabelled
+        following = self.next[after]
+        self.prev[node] = after
+        self.next[node] = following
+        self.next[after] = node
+        if following is None:
+            self.tail[k] = node
+            self.label[node] = self.label[after] + LABEL_GAP
+            return False
+        self.prev[following] = node
+        low, high = self.label[after], self.label[following]
+        if high - low > 1:
+            self.label[node] = (low + high) // 2
+            return False
+        label, current = 0, self.head[k]
+        while current is not None:
+            self.label[current] = label
+            label += LABEL_GAP
+            current = self.next[current]
+        return True
+
+    def _unlink(self, node, k):
+        prev, following = self.prev.pop(node), self.next.pop(node)
+        if prev is None:
+            self.head[k] = following
+        else:
+            self.next[prev] = following
+        if following is None:
+            self.tail[k] = prev
+        else:
+            self.prev[following] = prev
+        if self.head[k] is None:
+            del self.head[k]
+            del self.tail[k]
+
+
+def _peel(G):
+    """Core numbers and peeling order (Batagelj-Zaversnik bucket sort)"""
+    degrees = dict(G.degree())
+    order = sorted(degrees, key=degrees.get)
+    bin_starts = [0]
+    current = 0
+    for i, node in enumerate(order):
+        if degrees[node] > current:
+            bin_starts.extend([i] * (degrees[node] - current))
+            current = degrees[node]
+    position = {node: i for i, node in enumerate(order)}
+    core = degrees
+    neighbours = {node: list(G.adj[node]) for node in G}
+    for node in order:
+        for x in neighbours[node]:
+            if core[x] > core[node]:
+                # Move x to the start of its bin, then shrink its degree
+                neighbours[x].remove(node)
+                pos = position[x]
+                start = bin_starts[core[x]]
+                position[x] = start
+                position[order[start]] = pos
+                order[start], order[pos] = order[pos], order[start]
+                bin_starts[core[x]] += 1
+                core[x] -= 1
+    return core, order
@@ -1,16 +1,19 @@
 # metrics_calculator.py
 import networkx as nx
-import numpy as np
-from collections import Counter
 import config
+from performance import monitor, timed
+
+CENTRALITY_TYPES = ['degree', 'betweenness', 'closeness', 'eigenvector']
 
 class MetricsCalculator:
     """Calculates real-time network metrics"""
     
-    def __init__(self, network):
+    def __init__(self, network, core_numbers=None):
         self.G = network
         self._centrality_cache = {}
         self._community_cache = None
+        # Core numbers maintained elsewhere (e.g. by NetworkBuilder)
+        self._core_cache = core_numbers
     
     def calculate_density(self):
         """Calculate network density"""
@@ -28,79 +31,116 @@ class MetricsCalculator:
         degrees = dict(self.G.degree())
         return sum(degrees.values()) / len(degrees)
     
+    @timed('metrics.clustering')
     def calculate_clustering_coefficient(self):
         """Calculate average clustering coefficient"""
         if self.G.number_of_nodes() == 0:
             return 0.0
         return nx.average_clustering(self.G)
     
-    def calculate_centrality_metrics(self, force_recalculate=False):
-        """Calculate various centrality measures"""
-        if not force_recalculate and self._centrality_cache:
-            return self._centrality_cache.copy()  # Return copy to prevent external modification
-        
-        metrics = {}
-        
-        # Degree Centrality (always fast)
-        metrics['degree'] = nx.degree_centrality(self.G)
+    def calculate_centrality(self, centrality_type, force_recalculate=False):
+        """Calculate a single centrality measure (cached per type)"""
+        if not force_recalculate and centrality_type in self._centrality_cache:
+            monitor.count('metrics.centrality.cache_hit')
+            return self._centrality_cache[centrality_type]
         
-        # Betweenness Centrality (slow for large networks)
-        if config.CALCULATE_BETWEENNESS and self.G.number_of_nodes() < 1000:
-            try:
-                metrics['betweenness'] = nx.betweenness_centrality(self.G)
-            except:
-                metrics['betweenness'] = {}
-        else:
-            metrics['betweenness'] = {}
-        
-        # Closeness Centrality (only for connected graphs)
-        if nx.is_connected(self.G) and self.G.number_of_nodes() < 500:
-            try:
-                metrics['closeness'] = nx.closeness_centrality(self.G)
-            except:
-                metrics['closeness'] = {}
-        else:
-            metrics['closeness'] = {}
+        n = self.G.number_of_nodes()
+        values = {}
         
-        # Eigenvector Centrality
-        if self.G.number_of_nodes() < 500:
-            try:
-                metrics['eigenvector'] = nx.eigenvector_centrality(self.G, max_iter=100)
-            except:
-                metrics['eigenvector'] = {}
+        if centrality_type == 'degree':
+            # Degree Centrality (always fast)
+            with monitor.timer('metrics.centrality.degree'):
+                values = nx.degree_centrality(self.G)
+        elif centrality_type == 'betweenness':
+            # Betweenness Centrality (slow for large networks)
+            if config.CALCULATE_BETWEENNESS and n < 1000:
+                try:
+                    with monitor.timer('metrics.centrality.betweenness'):
+                        values = nx.betweenness_centrality(self.G)
+                except:
+                    values = {}
+        elif centrality_type == 'closeness':
+            # Closeness Centrality (only for connected graphs)
+            if 0 < n < 500 and nx.is_connected(self.G):
+                try:
+                    with monitor.timer('metrics.centrality.closeness'):
+                        values = nx.closeness_centrality(self.G)
+                except:
+                    values = {}
+        elif centrality_type == 'coreness':
+            # Core number (O(E), available at any network size)
+            values = self.calculate_core_numbers()
+        elif centrality_type == 'eigenvector':
+            # Eigenvector Centrality
+            if n < 500:
+                try:
+                    with monitor.timer('metrics.centrality.eigenvector'):
+                        values = nx.eigenvector_centrality(self.G, max_iter=100)
+                except:
+                    values = {}
         else:
-            metrics['eigenvector'] = {}
+            return {}
         
-        self._centrality_cache = metrics
-        return metrics.copy()  # Return copy to prevent external modification
+        self._centrality_cache[centrality_type] = values
+        return values
+    
+    def calculate_centrality_metrics(self, force_recalculate=False):
+        """Calculate various centrality measures"""
+        # New dict so callers cannot modify the cache
+        return {
+            centrality_type: self.calculate_centrality(centrality_type, force_recalculate)
+            for centrality_type in CENTRALITY_TYPES
+        }
     
     def get_top_central_nodes(self, centrality_type='degree', top_k=None):
         """Get top K most central nodes"""
         if top_k is None:
             top_k = config.TOP_K_NODES
         
-        metrics = self.calculate_centrality_metrics()
+        values = self.calculate_centrality(centrality_type)
         
-        if centrality_type not in metrics or not metrics[centrality_type]:
+        if not values:
             return []
         
         sorted_nodes = sorted(
-            metrics[centrality_type].items(),
+            values.items(),
             key=lambda x: x[1],
             reverse=True
         )
         return sorted_nodes[:top_k]
     
+    def calculate_core_numbers(self, force_recalculate=False):
+        """Calculate the core number (coreness) of every node"""
+        if not force_recalculate and self._core_cache is not None:
+            monitor.count('metrics.core.cache_hit')
+            return self._core_cache
+        
+        with monitor.timer('metrics.core'):
+            self._core_cache = nx.core_number(self.G) if self.G.number_of_nodes() > 0 else {}
+        return self._core_cache
+    
+    def get_k_core(self, min_coreness):
+        """Get the subgraph of nodes with coreness >= min_coreness"""
+        if min_coreness <= 0:
+            return self.G
+        core_numbers = self.calculate_core_numbers()
+        return self.G.subgraph(
+            node for node, k in core_numbers.items() if k >= min_coreness
+        )
+    
     def detect_communities(self, force_recalculate=False):
         """Detect communities using modularity optimization"""
         if not force_recalculate and self._community_cache is not None:
+            monitor.count('metrics.communities.cache_hit')
             return self._community_cache
         
         try:
             if self.G.number_of_nodes() < 2:
                 return {}
             
-            communities = nx.community.greedy_modularity_communities(self.G)
+            with monitor.timer('metrics.communities'):
+                communities = nx.community.greedy_modularity_communities(self.G)
+            monitor.count('metrics.communities.computed')
             
             # Create community dictionary
             community_dict = {}
@@ -114,14 +154,17 @@ class MetricsCalculator:
             print(f"Community detection error: {e}")
             return {}
     
+    @timed('metrics.modularity')
     def calculate_modularity(self):
         """Calculate network modularity"""
         try:
             communities = nx.community.greedy_modularity_communities(self.G)
+            monitor.count('metrics.communities.computed')
             return nx.community.modularity(self.G, communities)
         except:
             return 0.0
     
+    @timed('metrics.all')
     def get_all_metrics(self):
         """Get all metrics in one call"""
         return {
@@ -133,6 +176,7 @@ class MetricsCalculator:
             'modularity': self.calculate_modularity(),
             'is_connected': nx.is_connected(self.G),
             'num_components': nx.number_connected_components(self.G),
+            'max_coreness': max(self.calculate_core_numbers().values(), default=0),
             'diameter': nx.diameter(self.G) if nx.is_connected(self.G) else None,
             'avg_path_length': nx.average_shortest_path_length(self.G) 
                               if nx.is_connected(self.G) else None
@@ -1,16 +1,43 @@
 import networkx as nx
 from datetime import datetime
 from data_simulator import DataSimulator
+from kcore import IncrementalCoreDecomposition
+from stream_stats import StreamingStatistics
 import config
 
 class NetworkBuilder:
     """Manages network construction and updates"""
-    def __init__(self):
+    def __init__(self, num_nodes=None, network_type=None, seed=42,
+                 edges_to_add=None, edges_to_remove=None):
+        if num_nodes is None:
+            num_nodes = config.INITIAL_NODES
+        if network_type is None:
+            network_type = config.NETWORK_TYPE
         self.G = nx.Graph()
         self.simulator = DataSimulator(
-            num_nodes=config.INITIAL_NODES,
-            network_type=config.NETWORK_TYPE
+            num_nodes=num_nodes,
+            network_type=network_type,
+            seed=seed
         )
+        # Per-network update sizes; None falls back to config
+        self.edges_to_add = edges_to_add
+        self.edges_to_remove = edges_to_remove
+        self.stream_stats = StreamingStatistics(
+            width=config.SKETCH_WIDTH,
+            depth=config.SKETCH_DEPTH,
+            heavy_hitters=config.HEAVY_HITTERS_CAPACITY,
+            distinct_nodes=config.DISTINCT_SKETCH_NODES,
+            distinct_width=config.DISTINCT_SKETCH_WIDTH,
+            distinct_depth=config.DISTINCT_SKETCH_DEPTH,
+            hll_precision=config.HLL_PRECISION,
+            window_seconds=config.DISTINCT_WINDOW_SECONDS,
+            window_buckets=config.DISTINCT_WINDOW_BUCKETS,
+            decay=config.SPIKE_DECAY,
+            spike_window=config.SPIKE_WINDOW,
+            spike_threshold=config.SPIKE_THRESHOLD,
+            spike_min_events=config.SPIKE_MIN_EVENTS
+        )
+        self.core_decomposition = IncrementalCoreDecomposition(self.G)
         self.update_history = []
         self.initialized = False
     
@@ -18,6 +45,7 @@ class NetworkBuilder:
         """Initialize network with simulated data"""
         if not self.initialized:
             self.G = self.simulator.generate_initial_network()
+            self.core_decomposition.reset(self.G)
             self.initialized = True
             self.update_history.append({
                 'type': 'initialize',
@@ -28,22 +56,32 @@ class NetworkBuilder:
     
     def update_network(self, add_edges=None, remove_edges=None):
         """Update network with new edges"""
+        if add_edges is None:
+            add_edges = self.edges_to_add
         if add_edges is None:
             add_edges = config.EDGES_TO_ADD_PER_UPDATE
+        if remove_edges is None:
+            remove_edges = self.edges_to_remove
         if remove_edges is None:
             remove_edges = config.EDGES_TO_REMOVE_PER_UPDATE
         updates = self.simulator.simulate_update(
             self.G, 
             add_edges=add_edges,
-            remove_edges=remove_edges
+            remove_edges=remove_edges,
+            on_update=self.core_decomposition.apply_update
         )
         self.update_history.extend(updates)
+        self.stream_stats.process_updates(updates)
         return updates
     
     def get_network(self):
         """Return current network copy"""
         return self.G.copy()
     
+    def get_core_numbers(self):
+        """Get incrementally maintained core numbers of all nodes"""
+        return self.core_decomposition.get_core_numbers()
+    
     def get_update_history(self, limit=100):
         """Get recent update history"""
         return self.update_history[-limit:]
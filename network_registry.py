@@ -0,0 +1,116 @@
+# network_registry.py
+# Registry of named networks for multi-network monitoring
+import time
+
+from network_builder import NetworkBuilder
+from parallel_metrics import evaluate_networks, get_executor
+import config
+
+
+class NetworkRegistry:
+    """Manages several named networks, each with its own settings"""
+
+    def __init__(self, max_workers=None):
+        self.networks = {}  # name -> {'builder', 'settings', 'update_interval', 'last_update'}
+        self.max_workers = max_workers  # 0 evaluates metrics in-process
+        self._summary_cache = {}  # name -> (version, metrics)
+
+    @classmethod
+    def from_config(cls):
+        """Create a registry with the networks listed in config.NETWORKS"""
+        registry = cls(max_workers=config.METRICS_WORKERS)
+        for name, settings in config.NETWORKS.items():
+            registry.add_network(name, **settings)
+        return registry
+
+    def add_network(self, name, num_nodes=None, network_type=None, seed=42,
+                    update_interval=None, edges_to_add=None, edges_to_remove=None):
+        """Register and initialize a new network"""
+        if name in self.networks:
+            raise ValueError(f"Network '{name}' is already registered")
+        builder = NetworkBuilder(
+            num_nodes=num_nodes,
+            network_type=network_type,
+            seed=seed,
+            edges_to_add=edges_to_add,
+            edges_to_remove=edges_to_remove
+        )
+        builder.initialize_network()
+        self.networks[name] = {
+            'builder': builder,
+            'settings': {
+                'network_type': builder.simulator.network_type,
+                'initial_nodes': builder.simulator.num_nodes
+            },
+            'update_interval': update_interval if update_interval is not None
+                               else config.UPDATE_INTERVAL,
+            'last_update': time.monotonic()
+        }
+        return builder
+
+    def remove_network(self, name):
+        """Stop monitoring a network"""
+        self.networks.pop(name, None)
+        self._summary_cache.pop(name, None)
+
+    def get_builder(self, name):
+        """Get the NetworkBuilder of a registered network"""
+        return self.networks[name]['builder']
+
+    def names(self):
+        return list(self.networks)
+
+    def update_due(self, now=None):
+        """Update every network whose update interval has elapsed"""
+        if now is None:
+            now = time.monotonic()
+        updates = {}
+        for name, entry in self.networks.items():
+            if now - entry['last_update'] >= entry['update_interval']:
+                updates[name] = entry['builder'].update_network()
+                entry['last_update'] = now
+        return updates
+
+    def update_all(self):
+        """Update every network regardless of its interval"""
+        now = time.monotonic()
+        updates = {}
+        for name, entry in self.networks.items():
+            updates[name] = entry['builder'].update_network()
+            entry['last_update'] = now
+        return updates
+
+    def get_summary(self):
+        """Summary metrics of every network, evaluated in parallel.
+
+        Only networks that changed since the last call are recomputed.
+        """
+        stale = {}
+        for name, entry in self.networks.items():
+            version = len(entry['builder'].update_history)
+            cached = self._summary_cache.get(name)
+            if cached is None or cached[0] != version:
+                stale[name] = (version, entry['builder'].G)
+
+        if stale:
+            executor = self._get_executor() if len(stale) > 1 else None
+            results = evaluate_networks(
+                {name: G for name, (_, G) in stale.items()},
+                executor
+            )
+            for name, metrics in results.items():
+                self._summary_cache[name] = (stale[name][0], metrics)
+
+        summary = []
+        for name, entry in self.networks.items():
+            row = {'name': name}
+            row.update(entry['settings'])
+            row['update_interval'] = entry['update_interval']
+            row.update(self._summary_cache[name][1])
+            summary.append(row)
+        return summary
+
+    def _get_executor(self):
+        if self.max_workers == 0:
+            return None
+        return get_executor(self.max_workers)
@@ -0,0 +1,153 @@
+# parallel_metrics.py
+# Process-parallel metric evaluation with graphs passed via shared memory
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import networkx as nx
+import numpy as np
+
+from metrics_calculator import MetricsCalculator
+
+# Process-wide pool shared by every dashboard session (one thread each)
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+
+def share_graph(G):
+    """Copy G's edges into a shared-memory int32 array.
+
+    Nodes are relabelled 0..n-1 so only the edge array has to cross the
+    process boundary. Returns (shm, spec); the caller must close and
+    unlink shm once the workers are done with it.
+    """
+    index = {node: i for i, node in enumerate(G.nodes())}
+    num_edges = G.number_of_edges()
+    # SharedMemory cannot be zero-sized
+    shm = shared_memory.SharedMemory(create=True, size=max(num_edges * 2 * 4, 1))
+    edges = np.ndarray((num_edges, 2), dtype=np.int32, buffer=shm.buf)
+    edges[:] = np.fromiter(
+        (index[n] for edge in G.edges() for n in edge),
+        dtype=np.int32,
+        count=num_edges * 2
+    ).reshape(num_edges, 2)
+    del edges  # Release the buffer export so shm can be closed
+    spec = {
+        'shm_name': shm.name,
+        'num_nodes': len(index),
+        'num_edges': num_edges
+    }
+    return shm, spec
+
+
+def graph_from_spec(spec):
+    """Rebuild a graph from a shared-memory spec created by share_graph()"""
+    shm = _attach(spec['shm_name'])
+    try:
+        edges = np.ndarray((spec['num_edges'], 2), dtype=np.int32, buffer=shm.buf)
+        G = nx.Graph()
+        G.add_nodes_from(range(spec['num_nodes']))
+        G.add_edges_from(edges.tolist())
+        del edges
+    finally:
+        shm.close()
+    return G
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument; the parent owns the
+        # segment and pool workers share its resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def summarize_graph(G):
+    """Summary metrics shown in the multi-network table"""
+    metrics_calc = MetricsCalculator(G)
+    num_nodes = G.number_of_nodes()
+    return {
+        'nodes': num_nodes,
+        'edges': G.number_of_edges(),
+        'density': metrics_calc.calculate_density(),
+        'average_degree': metrics_calc.calculate_average_degree(),
+        'num_components': nx.number_connected_components(G) if num_nodes else 0,
+        'modularity': metrics_calc.calculate_modularity()
+    }
+
+
+def evaluate_network(spec):
+    """Worker: compute the summary metrics of one shared graph"""
+    return summarize_graph(graph_from_spec(spec))
+
+
+def get_executor(max_workers=None):
+    """Process pool for metric evaluation, shared by the whole process.
+
+    Uses the spawn start method: forking the threaded Streamlit server
+    is unsafe, and spawn behaves the same on every platform.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_workers = max_workers
+        return _executor
+
+
+def _discard_executor(executor):
+    """Shut down executor unless another session already replaced it"""
+    global _executor
+    with _executor_lock:
+        if _executor is not executor:
+            return
+        _executor = None
+    executor.shutdown(wait=False)
+
+
+def evaluate_networks(graphs, executor=None):
+    """Evaluate {name: graph} in parallel; returns {name: metrics}.
+
+    Without an executor the graphs are evaluated in this process, as they
+    are when the pool breaks or was shut down by another session.
+    """
+    if executor is None:
+        return {name: summarize_graph(G) for name, G in graphs.items()}
+
+    shared = {}
+    try:
+        # Registered one by one so the finally cleans up what was created
+        for name, G in graphs.items():
+            shared[name] = share_graph(G)
+        futures = {}
+        for name, (_, spec) in shared.items():
+            try:
+                futures[name] = executor.submit(evaluate_network, spec)
+            except BrokenProcessPool:
+                raise
+            except RuntimeError as e:
+                # Another session shut this pool down after we got it
+                print(f"Metrics worker pool unavailable, evaluating in-process: {e}")
+                for future in futures.values():
+                    future.cancel()
+                return {name: summarize_graph(G) for name, G in graphs.items()}
+        return {name: future.result() for name, future in futures.items()}
+    except BrokenProcessPool as e:
+        # A worker died; start a fresh pool next time and finish in-process
+        print(f"Metrics worker pool failed, evaluating in-process: {e}")
+        _discard_executor(executor)
+        return {name: summarize_graph(G) for name, G in graphs.items()}
+    finally:
+        for shm, _ in shared.values():
+            shm.close()
+            shm.unlink()
+
@@ -0,0 +1,235 @@
+# performance.py
+# Lightweight stage timers, counters and profiling for the dashboard
+import cProfile
+import io
+import json
+import math
+import pstats
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+WINDOW_SIZE = 200  # Rolling window of samples kept per stage
+PERCENTILES = (50, 95, 99)
+OVERHEAD_LIMIT = 0.01  # Instrumentation may cost at most 1% of a render
+
+
+class _NullTimer:
+    """No-op timer used while instrumentation is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager recording the elapsed time of one stage"""
+    __slots__ = ('monitor', 'name', 'start')
+
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class PerformanceMonitor:
+    """Collects stage timings and event counters with rolling percentiles"""
+
+    def __init__(self, window_size=WINDOW_SIZE, enabled=False):
+        self.window_size = window_size
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded timings and counters"""
+        with self._lock:
+            self._samples = {}
+            self._totals = {}
+            self._counts = {}
+            self._counters = {}
+            self.calls = 0  # Instrumentation calls, for overhead estimates
+
+    def timer(self, name):
+        """Return a context manager timing the named stage"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name, seconds):
+        """Record one timing sample for a stage"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window_size)
+                self._totals[name] = 0.0
+                self._counts[name] = 0
+            samples.append(seconds)
+            self._totals[name] += seconds
+            self._counts[name] += 1
+            self.calls += 1
+
+    def count(self, name, n=1):
+        """Increment an event counter"""
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + n
+                self.calls += 1
+
+    def get_stats(self):
+        """Get per-stage statistics over the rolling window"""
+        with self._lock:
+            snapshot = [
+                (name, list(samples), self._counts[name], self._totals[name])
+                for name, samples in self._samples.items()
+            ]
+        stats = {}
+        for name, samples, count, total in snapshot:
+            ordered = sorted(samples)
+            entry = {
+                'count': count,
+                'total_s': total,
+                'last_s': samples[-1],
+            }
+            for p in PERCENTILES:
+                entry[f'p{p}_s'] = _percentile(ordered, p)
+            stats[name] = entry
+        return stats
+
+    def get_counters(self):
+        """Get a copy of the event counters"""
+        with self._lock:
+            return dict(self._counters)
+
+    def to_json(self):
+        """Dump timings and counters as JSON"""
+        return json.dumps({
+            'stages': self.get_stats(),
+            'counters': self.get_counters()
+        }, indent=2)
+
+    def to_prometheus(self, prefix='network_dashboard'):
+        """Dump timings and counters in the Prometheus text format"""
+        lines = [
+            f'# HELP {prefix}_stage_seconds Time spent in each dashboard stage',
+            f'# TYPE {prefix}_stage_seconds summary'
+        ]
+        for name, entry in sorted(self.get_stats().items()):
+            label = f'stage="{name}"'
+            for p in PERCENTILES:
+                lines.append(f'{prefix}_stage_seconds{{{label},quantile="{p / 100}"}} '
+                             f'{entry[f"p{p}_s"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{{label}}} {entry["total_s"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{{label}}} {entry["count"]}')
+        lines.append(f'# HELP {prefix}_events_total Dashboard event counters')
+        lines.append(f'# TYPE {prefix}_events_total counter')
+        for name, value in sorted(self.get_counters().items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(int(math.ceil(p / 100 * len(ordered))), 1)
+    return ordered[rank - 1]
+
+
+# Streamlit runs every session in its own thread, so each thread records
+# into the monitor it selected with use_monitor() (one per session)
+_local = threading.local()
+_default_monitor = PerformanceMonitor()
+
+
+def use_monitor(selected):
+    """Route `monitor` to the given monitor for the calling thread"""
+    _local.monitor = selected
+
+
+def current_monitor():
+    """Monitor selected for the calling thread (a disabled default otherwise)"""
+    return getattr(_local, 'monitor', _default_monitor)
+
+
+class _MonitorProxy:
+    """Forwards to current_monitor() so modules can import one name"""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(current_monitor(), name)
+
+
+# Monitor used by the metrics, visualizer and app modules
+monitor = _MonitorProxy()
+
+_call_cost = None
+
+
+def instrumentation_call_cost(iterations=20000):
+    """Measured seconds one timed stage costs, through the shared proxy"""
+    global _call_cost
+    if _call_cost is None:
+        previous = current_monitor()
+        use_monitor(PerformanceMonitor(enabled=True))
+        try:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                with monitor.timer('calibration'):
+                    pass
+            timed_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(iterations):
+                pass
+            empty_s = time.perf_counter() - start
+        finally:
+            use_monitor(previous)
+        _call_cost = max(timed_s - empty_s, 0.0) / iterations
+    return _call_cost
+
+
+def estimate_overhead(calls, elapsed_s):
+    """Fraction of elapsed_s spent in `calls` instrumentation calls"""
+    if elapsed_s <= 0:
+        return 0.0
+    return calls * instrumentation_call_cost() / elapsed_s
+
+
+def timed(name):
+    """Decorator timing every call of a function under the given stage name"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with monitor.timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_profile():
+    """Start a cProfile capture"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, sort='cumulative', limit=30):
+    """Stop a cProfile capture and return the top entries as text"""
+    profiler.disable()
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
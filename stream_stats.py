@@ -0,0 +1,382 @@
+# stream_stats.py
+# Fixed-memory streaming statistics over network update events
+import hashlib
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+
+def _hash64(item):
+    """Stable 64-bit hash of an item (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(repr(item).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _columns(item, rows, width):
+    # Double hashing: column_i = h1 + i * h2 (mod width)
+    h = _hash64(item)
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    return (h1 + rows * h2) % width
+
+
+class CountMinSketch:
+    """Count-Min sketch with optional exponential decay of all counts"""
+
+    def __init__(self, width=1024, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self._rows = np.arange(depth)
+
+    def add(self, item, count=1.0):
+        """Add count occurrences of item"""
+        self.table[self._rows, _columns(item, self._rows, self.width)] += count
+
+    def estimate(self, item):
+        """Estimated (never under-counted) count of item"""
+        return float(self.table[self._rows, _columns(item, self._rows, self.width)].min())
+
+    def decay(self, factor):
+        """Multiply every count by factor"""
+        self.table *= factor
+
+    def memory_bytes(self):
+        return self.table.nbytes
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision registers"""
+
+    def __init__(self, precision=7):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, item):
+        """Add an item to the set"""
+        index, rank = _register(item, self.precision)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        """Estimated number of distinct items"""
+        return estimate_distinct(np.frombuffer(self.registers, dtype=np.uint8))
+
+    def memory_bytes(self):
+        return len(self.registers)
+
+
+def _register(item, precision):
+    # Register index from the top bits, rank from the remaining ones
+    x = _hash64(item)
+    index = x >> (64 - precision)
+    rest = x & ((1 << (64 - precision)) - 1)
+    return index, (64 - precision) - rest.bit_length() + 1
+
+
+class HyperLogLogTable:
+    """HyperLogLog distinct counters per key in a fixed Count-Min layout.
+
+    Each key hashes to one cell per row and every cell holds 2**precision
+    registers. Keys sharing a cell only inflate each other's count, so the
+    smallest row estimate is used. Memory does not depend on the keys seen.
+    """
+
+    def __init__(self, width=256, depth=2, precision=7):
+        self.width = width
+        self.depth = depth
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros((depth, width, self.m), dtype=np.uint8)
+        self._rows = np.arange(depth)
+
+    def add(self, key, item):
+        """Add item to the set of key"""
+        index, rank = _register(item, self.precision)
+        columns = _columns(key, self._rows, self.width)
+        cells = self.registers[self._rows, columns, index]
+        self.registers[self._rows, columns, index] = np.maximum(cells, rank)
+
+    def key_registers(self, key):
+        """Registers of the cells key maps to, one row per hash function"""
+        return self.registers[self._rows, _columns(key, self._rows, self.width)]
+
+    def count(self, key):
+        """Estimated number of distinct items of key"""
+        return estimate_distinct(self.key_registers(key))
+
+    def memory_bytes(self):
+        return self.registers.nbytes
+
+
+class DistinctSketches:
+    """Distinct items per key: exact-key sketches for the first `capacity`
+    keys, a shared HyperLogLogTable for any further keys.
+
+    Memory is bounded by the settings; the table is only allocated once
+    more than `capacity` keys were seen.
+    """
+
+    def __init__(self, capacity=256, table_width=256, table_depth=2, precision=7):
+        self.capacity = capacity
+        self.table_width = table_width
+        self.table_depth = table_depth
+        self.precision = precision
+        self.sketches = {}  # key -> HyperLogLog
+        self.overflow = None  # HyperLogLogTable
+
+    def add(self, key, item):
+        """Add item to the set of key"""
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            if len(self.sketches) >= self.capacity:
+                if self.overflow is None:
+                    self.overflow = HyperLogLogTable(
+                        self.table_width, self.table_depth, self.precision
+                    )
+                self.overflow.add(key, item)
+                return
+            sketch = self.sketches[key] = HyperLogLog(self.precision)
+        sketch.add(item)
+
+    def key_registers(self, key):
+        """Registers of key as a (rows, 2**precision) array, or None if unseen"""
+        sketch = self.sketches.get(key)
+        if sketch is not None:
+            return np.frombuffer(sketch.registers, dtype=np.uint8)[np.newaxis]
+        if self.overflow is not None:
+            return self.overflow.key_registers(key)
+        return None
+
+    def memory_bytes(self):
+        """Upper bound of the memory used by the registers"""
+        m = 1 << self.precision
+        return m * (self.capacity + self.table_width * self.table_depth)
+
+
+def estimate_distinct(key_registers):
+    """Smallest HyperLogLog estimate over the rows of key_registers"""
+    m = key_registers.shape[-1]
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    estimates = alpha * m * m / np.exp2(-key_registers.astype(np.float64)).sum(axis=-1)
+    zeros = (key_registers == 0).sum(axis=-1)
+    # Small range correction (linear counting)
+    small = (estimates <= 2.5 * m) & (zeros > 0)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return float(np.where(small, linear, estimates).min())
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters with a fixed number of counters"""
+
+    def __init__(self, capacity=50):
+        self.capacity = capacity
+        self.counters = {}  # item -> [count, error]
+
+    def add(self, item, count=1):
+        """Count item; returns the evicted item, if any"""
+        if item in self.counters:
+            self.counters[item][0] += count
+            return None
+        if len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+            return None
+        # Replace the item with the smallest count
+        evicted = min(self.counters, key=lambda k: self.counters[k][0])
+        min_count = self.counters.pop(evicted)[0]
+        self.counters[item] = [min_count + count, min_count]
+        return evicted
+
+    def top(self, k=None):
+        """Items as (item, count, error), most guaranteed occurrences first.
+
+        count over-estimates the true count by at most error, so
+        count - error is a guaranteed lower bound.
+        """
+        items = sorted(
+            ((item, c[0], c[1]) for item, c in self.counters.items()),
+            key=lambda x: (x[1] - x[2], x[1]),
+            reverse=True
+        )
+        return items[:k] if k else items
+
+    def __contains__(self, item):
+        return item in self.counters
+
+
+class StreamingStatistics:
+    """Bounded-memory per-node statistics fed by NetworkBuilder updates.
+
+    Memory depends only on the constructor settings, never on the number
+    of events:
+    - Count-Min sketch of slowly decayed new-connection counts (per-node
+      event rate and the baseline for spike detection)
+    - New-connection counts of the last few update batches (the recent
+      rate compared against that baseline)
+    - Space-Saving list of the nodes gaining the most connections
+    - HyperLogLog distinct-neighbour counts of every node over a sliding
+      window, one DistinctSketches per sub-window
+    """
+
+    def __init__(self, width=1024, depth=4, heavy_hitters=256,
+                 distinct_nodes=256, distinct_width=256, distinct_depth=2, hll_precision=7,
+                 window_seconds=3600, window_buckets=6, decay=0.99,
+                 spike_window=5, spike_threshold=3.0, spike_min_events=3,
+                 max_anomalies=50):
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.rates = CountMinSketch(width, depth)
+        self.heavy_hitters = SpaceSaving(heavy_hitters)
+        self.distinct_nodes = distinct_nodes
+        self.distinct_width = distinct_width
+        self.distinct_depth = distinct_depth
+        self.hll_precision = hll_precision
+        self.bucket_seconds = window_seconds / window_buckets
+        self.window_buckets = window_buckets
+        self.buckets = deque()  # (bucket_start, DistinctSketches)
+        self.decay = decay
+        self.spike_window = spike_window
+        self.recent_batches = deque()  # {node: count} of the last spike_window batches
+        self.recent_counts = {}  # node -> new connections in recent_batches
+        self.spike_threshold = spike_threshold
+        self.spike_min_events = spike_min_events
+        self.anomalies = deque(maxlen=max_anomalies)
+        self.anomalies_total = 0
+        self.events_processed = 0
+        self.batches_processed = 0
+
+    def process_updates(self, updates):
+        """Consume one batch of update events from DataSimulator"""
+        if not updates:
+            return []
+        batch_counts = {}
+        for update in updates:
+            self.events_processed += 1
+            if update['type'] != 'add':
+                continue
+            timestamp = update['timestamp'].timestamp()
+            for node, neighbour in ((update['node1'], update['node2']),
+                                    (update['node2'], update['node1'])):
+                batch_counts[node] = batch_counts.get(node, 0) + 1
+                self._add_neighbour(node, neighbour, timestamp)
+
+        self._add_recent_batch(batch_counts)
+        # Without a single earlier batch there is no baseline to compare to
+        anomalies = []
+        if self.batches_processed:
+            anomalies = self._detect_spikes(batch_counts, updates[-1]['timestamp'])
+
+        # Decay the old counts, then fold in this batch
+        self.rates.decay(self.decay)
+        for node, count in batch_counts.items():
+            self.rates.add(node, count)
+        self.batches_processed += 1
+        return anomalies
+
+    def _add_neighbour(self, node, neighbour, timestamp):
+        self.heavy_hitters.add(node)
+        self._current_bucket(timestamp).add(node, neighbour)
+
+    def _current_bucket(self, timestamp):
+        start = self._prune_buckets(timestamp)
+        if not self.buckets or self.buckets[-1][0] < start:
+            sketches = DistinctSketches(self.distinct_nodes, self.distinct_width,
+                                        self.distinct_depth, self.hll_precision)
+            self.buckets.append((start, sketches))
+        return self.buckets[-1][1]
+
+    def _prune_buckets(self, now):
+        """Drop buckets that slid out of the window; returns the current bucket start"""
+        start = now - now % self.bucket_seconds
+        while self.buckets and self.buckets[0][0] <= start - self.window_buckets * self.bucket_seconds:
+            self.buckets.popleft()
+        return start
+
+    def _add_recent_batch(self, batch_counts):
+        self.recent_batches.append(batch_counts)
+        for node, count in batch_counts.items():
+            self.recent_counts[node] = self.recent_counts.get(node, 0) + count
+        if len(self.recent_batches) > self.spike_window:
+            for node, count in self.recent_batches.popleft().items():
+                remaining = self.recent_counts[node] - count
+                if remaining:
+                    self.recent_counts[node] = remaining
+                else:
+                    del self.recent_counts[node]
+
+    def _detect_spikes(self, batch_counts, timestamp):
+        # Only nodes active in this batch can have started a new spike
+        anomalies = []
+        for node in batch_counts:
+            recent = self.recent_counts[node]
+            if recent < self.spike_min_events:
+                continue
+            expected = self.event_rate(node) * len(self.recent_batches)
+            if recent > self.spike_threshold * expected:
+                anomaly = {
+                    'node': node,
+                    'new_connections': recent,
+                    'baseline': expected,
+                    'score': recent / expected if expected > 0 else math.inf,
+                    'timestamp': timestamp
+                }
+                anomalies.append(anomaly)
+                self.anomalies.append(anomaly)
+        self.anomalies_total += len(anomalies)
+        return anomalies
+
+    def event_rate(self, node):
+        """Decayed new-connection rate of a node (per update batch)"""
+        n = self.batches_processed
+        if not n:
+            return 0.0
+        if self.decay == 1:
+            return self.rates.estimate(node) / n  # No decay: plain mean
+        # Decayed sum ~ rate * (1 - decay**n) / (1 - decay) after n batches
+        weight = (1 - self.decay) / (1 - self.decay ** n)
+        return self.rates.estimate(node) * weight
+
+    def distinct_neighbours(self, node, now=None):
+        """Estimated distinct new neighbours of a node within the window"""
+        self._prune_buckets(time.time() if now is None else now)
+        registers = [sketches.key_registers(node) for _, sketches in self.buckets]
+        registers = [r for r in registers if r is not None]
+        if not registers:
+            return 0.0
+        # Union of the sub-windows: register-wise maximum (rows broadcast)
+        return estimate_distinct(np.maximum.reduce(np.broadcast_arrays(*registers)))
+
+    def get_heavy_hitters(self, k=None):
+        """Nodes gaining the most connections with rate and distinct peers"""
+        return [
+            {
+                'node': node,
+                'guaranteed_connections': count - error,
+                'new_connections': count,
+                'error': error,
+                'rate': self.event_rate(node),
+                'distinct_neighbours': self.distinct_neighbours(node)
+            }
+            for node, count, error in self.heavy_hitters.top(k)
+        ]
+
+    def get_recent_anomalies(self, limit=20):
+        """Most recent degree-spike anomalies, newest first"""
+        return list(self.anomalies)[-limit:][::-1]
+
+    def memory_bytes(self):
+        """Upper bound of sketch memory, fixed by the configuration"""
+        hll_bytes = ((1 << self.hll_precision) * self.window_buckets
+                     * (self.distinct_nodes + self.distinct_width * self.distinct_depth))
+        return self.rates.memory_bytes() + hll_bytes
+
+    def get_summary(self):
+        return {
+            'events_processed': self.events_processed,
+            'batches_processed': self.batches_processed,
+            'tracked_nodes': len(self.heavy_hitters.counters),
+            'anomalies': self.anomalies_total,
+            'memory_bytes': self.memory_bytes()
+        }
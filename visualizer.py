@@ -1,8 +1,24 @@
 import networkx as nx
 import plotly.graph_objects as go
-import numpy as np
-import matplotlib.pyplot as plt
 import config
+from performance import monitor
+
+# Qualitative "Set3" palette (same colors as matplotlib's Set3 colormap)
+COMMUNITY_PALETTE = [
+    (141, 211, 199), (255, 255, 179), (190, 186, 218), (251, 128, 114),
+    (128, 177, 211), (253, 180, 98), (179, 222, 105), (252, 205, 229),
+    (217, 217, 217), (188, 128, 189), (204, 235, 197), (255, 237, 111)
+]
+
+
+def sample_palette(num_colors):
+    """Sample num_colors evenly spaced colors from the community palette"""
+    if num_colors <= 1:
+        return [COMMUNITY_PALETTE[0]]
+    step = 1.0 / (num_colors - 1)
+    last = len(COMMUNITY_PALETTE) - 1
+    return [COMMUNITY_PALETTE[min(int(i * step * len(COMMUNITY_PALETTE)), last)]
+            for i in range(num_colors)]
 
 class NetworkVisualizer:
     """Creates interactive network visualizations"""
@@ -10,10 +26,30 @@ class NetworkVisualizer:
     def __init__(self, network):
         self.G = network
     
+    def compute_layout(self, layout='spring'):
+        """Compute node positions for the given layout algorithm"""
+        with monitor.timer(f'visualizer.layout.{layout}'):
+            return self._compute_layout(layout)
+    
+    def _compute_layout(self, layout):
+        """Run the layout algorithm without instrumentation"""
+        if layout == 'spring':
+            return nx.spring_layout(self.G, k=1, iterations=config.LAYOUT_ITERATIONS, seed=42)
+        elif layout == 'circular':
+            return nx.circular_layout(self.G)
+        elif layout == 'kamada_kawai':
+            try:
+                return nx.kamada_kawai_layout(self.G)
+            except:
+                return nx.spring_layout(self.G, seed=42)
+        else:
+            return nx.spring_layout(self.G, seed=42)
+    
     def create_plotly_network(self, community_dict=None, 
                              centrality_dict=None,
                              layout='spring',
-                             show_labels=True):
+                             show_labels=True,
+                             pos=None):
         """Create interactive Plotly network visualization"""
         
         if self.G.number_of_nodes() == 0:
@@ -26,18 +62,17 @@ class NetworkVisualizer:
             )
             return fig
         
-        # Calculate layout
-        if layout == 'spring':
-            pos = nx.spring_layout(self.G, k=1, iterations=config.LAYOUT_ITERATIONS, seed=42)
-        elif layout == 'circular':
-            pos = nx.circular_layout(self.G)
-        elif layout == 'kamada_kawai':
-            try:
-                pos = nx.kamada_kawai_layout(self.G)
-            except:
-                pos = nx.spring_layout(self.G, seed=42)
-        else:
-            pos = nx.spring_layout(self.G, seed=42)
+        # Calculate layout (skipped when positions are supplied)
+        if pos is None:
+            pos = self.compute_layout(layout)
+        
+        with monitor.timer('visualizer.figure'):
+            return self._build_figure(pos, community_dict, centrality_dict, show_labels)
+    
+    def _build_figure(self, pos, community_dict, centrality_dict, show_labels):
+        """Build the Plotly figure from precomputed node positions"""
+        monitor.count('visualizer.nodes_drawn', self.G.number_of_nodes())
+        monitor.count('visualizer.edges_drawn', self.G.number_of_edges())
         
         # Extract node positions
         node_x = [pos[node][0] for node in self.G.nodes()]
@@ -70,14 +105,12 @@ class NetworkVisualizer:
             num_communities = len(set(community_dict.values()))
             if num_communities == 0:
                 num_communities = 1
-            colors = plt.cm.Set3(np.linspace(0, 1, max(num_communities, 1)))
+            colors = [f'rgb({r}, {g}, {b})' for r, g, b in sample_palette(num_communities)]
             for node in self.G.nodes():
                 comm_id = community_dict.get(node, 0)
                 # Ensure comm_id is within bounds
                 comm_id = min(comm_id, len(colors) - 1) if len(colors) > 0 else 0
-                node_colors.append(f'rgb({int(colors[comm_id][0]*255)}, '
-                                  f'{int(colors[comm_id][1]*255)}, '
-                                  f'{int(colors[comm_id][2]*255)})')
+                node_colors.append(colors[comm_id])
         else:
             node_colors = ['lightblue'] * self.G.number_of_nodes()
         